@@ -1,27 +1,77 @@
 """Top-level package for ML Launchpad."""
 
 # Stdlib imports
-from typing import Dict, Union
-
-# Third-party imports
-import pkg_resources
+import importlib
+from typing import TYPE_CHECKING, Dict, Union
 
 # Project imports
-from mllaunchpad import (
-    api,
-    datasources,
-    model_actions,
-    model_interface,
-    resource,
+from mllaunchpad.model_interface import (
+    ModelInterface,
+    ModelMakerInterface,
+    register_model,
+    register_model_maker,
 )
-from mllaunchpad.config import get_validated_config, get_validated_config_str
-from mllaunchpad.model_actions import _add_to_train_report as report
-from mllaunchpad.model_actions import predict, retest, train_model
-from mllaunchpad.model_interface import ModelInterface, ModelMakerInterface
-from mllaunchpad.resource import order_columns
 
 
-__version__ = pkg_resources.get_distribution("mllaunchpad").version
+try:
+    # Stdlib imports
+    from importlib.metadata import version as _get_version
+except ImportError:  # pragma: no cover  # Python 3.7
+    # Third-party imports
+    import pkg_resources
+
+    def _get_version(name):
+        return pkg_resources.get_distribution(name).version
+
+
+__version__ = _get_version("mllaunchpad")
+
+if TYPE_CHECKING:  # pragma: no cover
+    # Project imports
+    from mllaunchpad import api, datasources, model_actions, resource
+    from mllaunchpad.config import (
+        get_validated_config,
+        get_validated_config_str,
+    )
+    from mllaunchpad.model_actions import _add_to_train_report as report
+    from mllaunchpad.model_actions import predict, retest, train_model
+    from mllaunchpad.resource import order_columns
+
+# Imported on first use, so that e.g. the command line help does not need
+# to wait for pandas, Flask, yaml etc. to be imported.
+_lazy_attributes = {
+    "get_validated_config": ("mllaunchpad.config", "get_validated_config"),
+    "get_validated_config_str": (
+        "mllaunchpad.config",
+        "get_validated_config_str",
+    ),
+    "api": ("mllaunchpad.api", None),
+    "datasources": ("mllaunchpad.datasources", None),
+    "model_actions": ("mllaunchpad.model_actions", None),
+    "resource": ("mllaunchpad.resource", None),
+    "train_model": ("mllaunchpad.model_actions", "train_model"),
+    "retest": ("mllaunchpad.model_actions", "retest"),
+    "predict": ("mllaunchpad.model_actions", "predict"),
+    "report": ("mllaunchpad.model_actions", "_add_to_train_report"),
+    "order_columns": ("mllaunchpad.resource", "order_columns"),
+}
+
+
+def __getattr__(name):
+    if name not in _lazy_attributes:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        )
+    module_name, attr_name = _lazy_attributes[name]
+    value = importlib.import_module(module_name)
+    if attr_name is not None:
+        value = getattr(value, attr_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes))
 
 
 def list_models(model_store_location_or_config_dict: Union[Dict, str]):
@@ -59,7 +109,10 @@ def list_models(model_store_location_or_config_dict: Union[Dict, str]):
 
     :returns: Dict with information on all available trained models.
     """
-    ms = resource.ModelStore(model_store_location_or_config_dict)
+    # Project imports
+    from mllaunchpad.resource import ModelStore
+
+    ms = ModelStore(model_store_location_or_config_dict)
     return ms.list_models()
 
 
@@ -72,6 +125,8 @@ __all__ = [
     "get_validated_config_str",
     "ModelInterface",
     "ModelMakerInterface",
+    "register_model_maker",
+    "register_model",
     "order_columns",
     "report",
     "list_models",
@@ -6,11 +6,14 @@
 
 # Stdlib imports
 import logging
+import os
 import re
+import sys
 from collections import OrderedDict
+from functools import lru_cache
 
 # Third-party imports
-import ramlfications
+import pandas as pd
 from flask_restful import Api, Resource, reqparse
 from werkzeug.datastructures import FileStorage
 
@@ -20,6 +23,8 @@ from mllaunchpad import model_actions, resource
 
 logger = logging.getLogger(__name__)
 
+_MAJOR_VERSION_RE = re.compile(r"\d+")
+
 # TODO: factor out datasource/model preparation code -- use model_actions instead of low-level functionality
 
 
@@ -30,7 +35,7 @@ def get_api_base_url(config):
 
 
 def _get_major_api_version(config):
-    match = re.match(r"\d+", config["model"]["version"])
+    match = _MAJOR_VERSION_RE.match(config["model"]["version"])
     if match is None:
         raise ValueError(
             "Model version in configuration is malformed. Expected x.y.z, got {}".format(
@@ -40,11 +45,32 @@ def _get_major_api_version(config):
     return "v{}".format(match.group(0))
 
 
+@lru_cache(maxsize=16)
+def _parse_raml_cached(raml_file, file_id):
+    # Third-party imports
+    import ramlfications
+
+    # file_id is only part of the cache key (changes when the file changes)
+    return ramlfications.parse(raml_file)
+
+
+def _parse_raml(raml_file):
+    # Third-party imports
+    import ramlfications
+
+    try:
+        stat = os.stat(raml_file)
+    except OSError:
+        # Let ramlfications report the problem
+        return ramlfications.parse(raml_file)
+    return _parse_raml_cached(raml_file, (stat.st_mtime_ns, stat.st_size))
+
+
 def _load_raml(config):
     api_config = config["api"]
     raml_file = api_config["raml"]
     logger.debug("Reading RAML file %s", raml_file)
-    raml = ramlfications.parse(api_config["raml"])
+    raml = _parse_raml(raml_file)
 
     conf_version = _get_major_api_version(config)
     if raml.version != conf_version:
@@ -78,14 +104,21 @@ def _create_request_parser(resource_obj):
         resource_obj.form_params or []
     )
     added_arguments = set()
+    type_lookup = _type_lookup
+    help_suffix = " - Error: {error_msg}"
     parser = reqparse.RequestParser(bundle_errors=True)
     for p in all_params:
-        if p.name in added_arguments and not p.repeat:
-            raise ValueError(
-                "Cannot handle RAML with multiple parameters sharing same name {}".format(
-                    p.name
+        if p.name in added_arguments:
+            if not p.repeat:
+                raise ValueError(
+                    "Cannot handle RAML with multiple parameters sharing same name {}".format(
+                        p.name
+                    )
                 )
-            )
+            # Replace instead of adding the same argument twice
+            add_argument = parser.replace_argument
+        else:
+            add_argument = parser.add_argument
 
         # https://help.mulesoft.com/s/article/Repeat-query-parameters-using-RAML-1-0
         try:
@@ -96,14 +129,22 @@ def _create_request_parser(resource_obj):
             is_array = False
         is_array = is_array or p.repeat
 
-        parser.add_argument(
+        arg_type = type_lookup.get(param_type)
+        if arg_type is None:
+            raise ValueError(
+                "Unsupported type {} of parameter {} in RAML (supported: {})".format(
+                    p.type, p.name, ", ".join(type_lookup)
+                )
+            )
+
+        add_argument(
             p.name,
-            type=_type_lookup[param_type],
+            type=arg_type,
             required=p.required,
             default=p.default,
             action="append" if is_array else "store",
             choices=p.enum,
-            help=str(p.description) + " - Error: {error_msg}",
+            help=str(p.description) + help_suffix,
         )
         added_arguments.add(p.name)
 
@@ -131,18 +172,21 @@ def _get_resources(raml):
     """Gets relevant resources from RAML"""
     # only dealing with "get" method resources for now
     usable_methods = ["get", "post"]
-    usable_rs = [
-        r for r in raml.resources if r.method in usable_methods
-    ]  # r.path == name and
-    rs_without_resource_id = [
-        r for r in usable_rs if not r.uri_params and not r.body
-    ]
-    rs_with_resource_id = [r for r in usable_rs if r.uri_params]
-    rs_file_upload = [
-        r
-        for r in usable_rs
-        if r.body and r.body[0].mime_type == "multipart/form-data"
-    ]
+    usable_rs = []
+    rs_without_resource_id = []
+    rs_with_resource_id = []
+    rs_file_upload = []
+    # Categorize in a single pass
+    for r in raml.resources:
+        if r.method not in usable_methods:
+            continue
+        usable_rs.append(r)
+        if r.uri_params:
+            rs_with_resource_id.append(r)
+        elif not r.body:
+            rs_without_resource_id.append(r)
+        if r.body and r.body[0].mime_type == "multipart/form-data":
+            rs_file_upload.append(r)
     if (
         len(usable_rs) == 0
         or len(usable_rs) > 3
@@ -180,6 +224,27 @@ class QueryResource(Resource):
         logger.debug("Received GET request with arguments: %s", args)
         return self.model_api.predict_using_model(args)
 
+    def post(self):
+        args = self.parser.parse_args(strict=True)
+        logger.debug("Received POST request with arguments: %s", args)
+        return self.model_api.predict_using_model(args)
+
+
+class FileUploadResource(Resource):
+    def __init__(self, model_api_obj, parser):
+        self.model_api = model_api_obj
+        self.parser = parser
+
+    def post(self):
+        args = self.parser.parse_args(strict=True)
+        file_storage_obj = args["file"]
+        logger.debug(
+            "Received POST request with file %s of mimetype %s",
+            file_storage_obj.filename,
+            file_storage_obj.mimetype,
+        )
+        return self.model_api.predict_using_model(args)
+
 
 class GetByIdResource(Resource):
     def __init__(self, model_api_obj, parser, id_name):
@@ -262,10 +327,12 @@ class ModelApi:
 
         # Workaround (tensorflow has problem with spontaneously created threads such as with Flask):
         # https://kobkrit.com/tensor-something-is-not-an-element-of-this-graph-error-in-keras-on-flask-web-server-4173a8fe15e1
+        # Only relevant if tensorflow is in use already (e.g. loaded by the
+        # model), so don't spend time importing it otherwise.
+        tf = sys.modules.get("tensorflow")
         try:
-            # Third-party imports
-            import tensorflow as tf
-
+            if tf is None:
+                raise ImportError("tensorflow has not been imported")
             graph = tf.get_default_graph()
             self.model_wrapper.__graph = graph
         except Exception as e:
@@ -307,12 +374,9 @@ class ModelApi:
                 )
                 resource_urls["file"] = api_url + res_file.path
                 parsers["file"] = _create_request_parser(res_file)
-            if (
-                len(resource_urls) == 2
-                and resource_urls["query"] == resource_urls["file"]
-            ):
+            if resource_urls["query"] == resource_urls["file"]:
                 api.add_resource(
-                    QueryOrFileUploadResource,  # QueryResource,
+                    QueryOrFileUploadResource,
                     resource_urls["query"],
                     resource_class_kwargs={
                         "model_api_obj": self,
@@ -321,20 +385,20 @@ class ModelApi:
                     },
                 )
             else:
+                # Only register what each URL actually needs
+                resource_classes = {
+                    "query": QueryResource,
+                    "file": FileUploadResource,
+                }
                 for k, res_url in resource_urls.items():
                     if not res_url:
                         continue
                     api.add_resource(
-                        QueryOrFileUploadResource,  # QueryResource,
+                        resource_classes[k],
                         res_url,
                         resource_class_kwargs={
                             "model_api_obj": self,
-                            "query_parser": parsers["query"]
-                            if k == "query"
-                            else None,
-                            "file_parser": parsers["file"]
-                            if k == "file"
-                            else None,
+                            "parser": parsers[k],
                         },
                     )
 
@@ -362,7 +426,9 @@ class ModelApi:
             )
 
     def predict_using_model(self, args_dict):
-        logger.debug("Prediction input %s", dict(args_dict))
+        if logger.isEnabledFor(logging.DEBUG):
+            # Only copy the input when it will actually be logged
+            logger.debug("Prediction input %s", dict(args_dict))
         logger.info("Starting prediction")
         args_ordered_dict = OrderedDict(sorted(args_dict.items()))
         inner_model = self.model_wrapper.contents
@@ -425,19 +491,29 @@ class ModelApi:
         return model
 
 
-_pd_type_lookup = {
-    "object": "string",
-    "int64": "integer",
-    "float64": "number",
-    "bool": "boolean",
-    "datetime64": "date",  # https://github.com/raml-org/raml-spec/blob/master/versions/raml-08/raml-08.md#date-representations
-    "category": "string"  # plus enum: list(series.cat.categories)
+# By numpy dtype kind, so that e.g. int32 and int64 are covered alike.
+# Categories are of kind "O" and are strings (plus enum: categories).
+# Other kinds are treated as strings.
+_pd_kind_lookup = {
+    "O": "string",
+    "U": "string",
+    "S": "string",
+    "i": "integer",
+    "u": "integer",
+    "f": "number",
+    "b": "boolean",
+    "M": "date",  # https://github.com/raml-org/raml-spec/blob/master/versions/raml-08/raml-08.md#date-representations
     # RAML Types: any, object, array, union via type expression,
     #             one of the following scalar types: number, boolean, string,
     #             date-only, time-only, datetime-only, datetime, file, integer, or nil
 }
 
 
+# Characters which are not allowed unquoted in RAML parameter names
+_RAML_ILLEGAL_CHARS = frozenset(':.,[]"\\ \n\t')
+_RAML_CLEAN_TABLE = str.maketrans(dict.fromkeys(_RAML_ILLEGAL_CHARS, "_"))
+
+
 def generate_raml(
     complete_conf,
     data_source_name=None,
@@ -458,7 +534,10 @@ def generate_raml(
         df = data_frame
     else:
         raise ValueError("Please provide a data_source_name or a data_frame")
-    sample = df.sample(1).reset_index(drop=True)
+    if df.empty:
+        raise ValueError("Cannot generate RAML examples from empty data")
+    # First row as example (cheap and reproducible, unlike df.sample)
+    sample = df.iloc[:1].reset_index(drop=True)
     api_name = complete_conf["api"]["name"]
     api_version = _get_major_api_version(complete_conf)
     url_start = f"http://127.0.0.1:5000/{quote_plus(api_name)}/{api_version}/{resource_name}?"
@@ -466,7 +545,8 @@ def generate_raml(
     param_hints = """# can be false if optional, then provide a default here or be prepared to deal with missing values in your prediction
         #default: {}  # only makes sense for required: false
         #minimum: 0  # optional, maximum, minLength and others are also possible."""
-    output = f"""#%RAML 0.8
+    parts = [
+        f"""#%RAML 0.8
 ---
 title: Put title of your {api_name} API here
 baseUri: https://{{host}}/{api_name}/{{version}}
@@ -481,35 +561,35 @@ documentation:
   get:  # We can support 'post' as well if needed (let us know if necessary)
     description: Briefly describe what {resource_name} exactly you get from this API
     queryParameters:  # For all ways to specify parameters see https://github.com/raml-org/raml-spec/blob/master/versions/raml-08/raml-08.md#named-parameters"""
+    ]
     for col_name in sample.columns:
         series = sample[col_name]
-        type_str = str(series.dtype)
-        raml_type = _pd_type_lookup[type_str]
+        is_category = isinstance(series.dtype, pd.CategoricalDtype)
+        raml_type = _pd_kind_lookup.get(series.dtype.kind, "string")
         example = repr(series[0])
-        url_params += [quote_plus(col_name) + "=" + quote_plus(example)]
-        illegal_chars = ':.,[]"\\ \n\t'
+        url_params.append(quote_plus(col_name) + "=" + quote_plus(example))
         quoted_col_name = (
-            f"'{col_name}'"
-            if any(c in illegal_chars for c in col_name)
-            else col_name
+            col_name
+            if _RAML_ILLEGAL_CHARS.isdisjoint(col_name)
+            else f"'{col_name}'"
         )
-        cleaned_col_name = "".join(
-            "_" if c in illegal_chars else c for c in col_name
-        )
-        output += f"""
+        cleaned_col_name = col_name.translate(_RAML_CLEAN_TABLE)
+        parts.append(
+            f"""
       {quoted_col_name}:
         displayName: Friendly Name of {cleaned_col_name}
         type: {raml_type}
         description: Description of what {cleaned_col_name} really is
         example: {example}
-        required: true  """ + param_hints.format(
-            example
+        required: true  """
+            + param_hints.format(example)
         )
-        if type_str == "category":
-            output += "\n        enum: " + str(list(series.cat.categories))
+        if is_category:
+            parts.append("\n        enum: " + str(list(series.cat.categories)))
         param_hints = ""
 
-    output += f"""
+    parts.append(
+        f"""
     responses:
       200:  # OK
         body:
@@ -568,4 +648,5 @@ documentation:
   # Official RAML specification: https://github.com/raml-org/raml-spec/blob/master/versions/raml-08/raml-08.md
   #########################################################################
 """
-    return output
+    )
+    return "".join(parts)
@@ -2,18 +2,17 @@
 
 # Stdlib imports
 import json
+import os
 import sys
 from logging import Logger
 from typing import Dict
 
 # Third-party imports
 import click
-from flask import Flask
 
 # Project imports
 import mllaunchpad as mllp
 from mllaunchpad import logutil
-from mllaunchpad.api import ModelApi, generate_raml
 
 
 # Fix for click using the wrong name if run using `python -m mllaunchpad`
@@ -58,6 +57,13 @@ class Settings:
     def config(self):
         if not hasattr(self, "_config") or not self._config:
             if self.conf_file:
+                # Checked here instead of by click, so that a stale
+                # LAUNCHPAD_CFG does not break e.g. `mllaunchpad train --help`
+                if not os.path.exists(self.conf_file):
+                    raise click.BadParameter(
+                        "File '{}' does not exist.".format(self.conf_file),
+                        param_hint="'--config' / LAUNCHPAD_CFG",
+                    )
                 self._config = mllp.get_validated_config(self.conf_file)
             else:
                 self._config = mllp.get_validated_config()
@@ -75,7 +81,8 @@ pass_settings = click.make_pass_decorator(Settings, ensure=True)
 @click.option(
     "--config",
     "-c",
-    type=click.Path(exists=True),
+    envvar="LAUNCHPAD_CFG",
+    type=click.Path(),
     help="Use this configuration file. [default: look for env var LAUNCHPAD_CFG or ./LAUNCHPAD_CFG.yml]",
 )
 @click.option(
@@ -116,6 +123,12 @@ def retest(settings):
 @pass_settings
 def api(settings):
     """Run API server in unsafe debug mode."""
+    # Third-party imports
+    from flask import Flask
+
+    # Project imports
+    from mllaunchpad.api import ModelApi
+
     settings.logger.warning(
         "Starting Flask debug server. In production, please "
         "use a WSGI server, e.g.\n"
@@ -155,6 +168,9 @@ def cli_generate_raml(settings, datasource_name):
     The datasource named DATASOURCE_NAME in the config will be used
     to create the API's query parameters (from columns), types, and examples.
     """
+    # Project imports
+    from mllaunchpad.api import generate_raml
+
     print(generate_raml(settings.config, data_source_name=datasource_name))
 
 
@@ -3,9 +3,11 @@
 """
 
 # Stdlib imports
+import json
 import logging
 import os
-from typing import AnyStr, Dict, TextIO, Union
+import pickle  # nosec # only used to copy configs in memory
+from typing import AnyStr, Dict, List, Optional, TextIO, Tuple, Union
 
 # Third-party imports
 import yaml  # https://camel.readthedocs.io/en/latest/yamlref.html
@@ -17,7 +19,12 @@ from mllaunchpad.yaml_loader import SafeIncludeLoader
 logger = logging.getLogger(__name__)
 
 CONFIG_DEFAULT = "./LAUNCHPAD_CFG.yml"
-CONFIG_ENV = os.environ.get("LAUNCHPAD_CFG", CONFIG_DEFAULT)
+CONFIG_ENV_VAR = "LAUNCHPAD_CFG"
+# Deprecated: evaluated only once at import time. The config file is now
+# looked up via CONFIG_ENV_VAR whenever `get_validated_config` is called.
+CONFIG_ENV = os.environ.get(CONFIG_ENV_VAR, CONFIG_DEFAULT)
+CONFIG_CACHE_ENV = "LAUNCHPAD_CFG_CACHE"
+CONFIG_CACHE_SUFFIX = ".cache.json"
 required_config: Dict[str, Dict] = {
     # datasources and datasinks are optional
     "model_store": {"location": {}},
@@ -33,34 +40,176 @@ required_config: Dict[str, Dict] = {
     # https://github.com/schuderer/mllaunchpad-template
 }
 
+# Validated configs by absolute file name, with the modification times and
+# sizes of the config file and its included files (see `_get_file_ids`)
+# The configs are stored pickled, as unpickling is a lot faster than deepcopy
+_config_cache: Dict[str, Tuple[Dict[str, List[int]], bytes]] = {}
+
+
+def _get_required_paths(required, path=()) -> List[Tuple[str, ...]]:
+    """Flatten the nested dict of required keys into key paths."""
+    paths = []
+    for item, sub_required in required.items():
+        paths.append(path + (item,))
+        paths.extend(_get_required_paths(sub_required, path + (item,)))
+    return paths
+
+
+_required_config_paths = _get_required_paths(required_config)
+
 
 def validate_config(config_dict, required, path=""):
-    for item in required:
-        path_start = (path + ":") if path else ""
-        if item not in config_dict:
+    if required is required_config:
+        paths = _required_config_paths
+    else:
+        paths = _get_required_paths(required)
+    prefix = (path + ":") if path else ""
+    for key_path in paths:
+        # Parents have been checked before their children
+        parent = config_dict
+        for key in key_path[:-1]:
+            parent = parent[key]
+        if not isinstance(parent, dict) or key_path[-1] not in parent:
             raise ValueError(
-                "Missing key in config file: {}".format(path_start + item)
+                "Missing key in config file: {}".format(
+                    prefix + ":".join(key_path)
+                )
             )
-        validate_config(config_dict[item], required[item], path_start + item)
 
 
 def check_semantics(config_dict):
-    if "api" in config_dict and "version" in config_dict["api"]:
+    if "version" in config_dict.get("api", {}):
         raise ValueError(
             "'api:version:' is not allowed in the config, "
             "only 'model:version:'."
         )
 
 
-def get_validated_config(filename: str = CONFIG_ENV) -> dict:
+def _get_file_ids(filenames: List[str]) -> Optional[Dict[str, List[int]]]:
+    """Get modification time and size of the files by absolute file name,
+    or None if one of them cannot be accessed.
+    """
+    try:
+        return {
+            fn: [st.st_mtime_ns, st.st_size]
+            for fn, st in (
+                (os.path.abspath(fn), os.stat(fn)) for fn in filenames
+            )
+        }
+    except OSError:
+        return None
+
+
+def clear_config_cache() -> None:
+    """Forget all configurations which have been read so far."""
+    _config_cache.clear()
+
+
+def _load_config_cache(
+    filename: str,
+) -> Optional[Tuple[Dict[str, List[int]], dict]]:
+    """Return the file ids and cached config if the config file and all
+    files included by it are unchanged, else None.
+    """
+    try:
+        with open(filename + CONFIG_CACHE_SUFFIX, "rb") as f:
+            cached = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    sources = cached.get("sources", {})
+    if (
+        os.path.abspath(filename) not in sources
+        or _get_file_ids(list(sources)) != sources
+    ):
+        return None
+    logger.debug(
+        "Using cached configuration %s", filename + CONFIG_CACHE_SUFFIX
+    )
+    return sources, cached["config"]
+
+
+def _dump_config_cache(
+    filename: str, config_dict: dict, sources: Dict[str, List[int]]
+) -> None:
+    try:
+        contents = json.dumps({"sources": sources, "config": config_dict})
+    except (TypeError, ValueError):
+        contents = None
+    if contents is None or json.loads(contents)["config"] != config_dict:
+        # E.g. dates or non-string keys, which JSON cannot round-trip
+        logger.debug("Configuration %s cannot be cached as JSON", filename)
+        return
+    cache_name = filename + CONFIG_CACHE_SUFFIX
+    tmp_name = cache_name + ".tmp"
+    try:
+        with open(tmp_name, "w", encoding="utf-8") as f:
+            f.write(contents)
+        os.replace(tmp_name, cache_name)
+    except OSError as e:
+        logger.debug("Could not write configuration cache: %s", e)
+
+
+def _use_config_cache() -> bool:
+    return os.environ.get(CONFIG_CACHE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def _validated(config_dict: dict) -> dict:
+    validate_config(config_dict, required_config)
+    check_semantics(config_dict)
+
+    logger.debug("Configuration loaded and validated: %s", config_dict)
+
+    return config_dict
+
+
+def _read_config(
+    filename: str,
+) -> Tuple[Optional[Dict[str, List[int]]], dict]:
+    """Read and validate the config file (or its JSON cache), returning the
+    file ids (see `_get_file_ids`) of all files involved, and the config.
+    """
+    use_file_cache = _use_config_cache()
+    if use_file_cache:
+        cached = _load_config_cache(filename)
+        if cached is not None:
+            return cached
+
+    # libyaml parses bytes directly, without a Python text stream
+    with open(filename, "rb") as f:
+        raw = f.read()
+    loader = SafeIncludeLoader(raw, root=os.path.dirname(filename))
+    try:
+        y = _validated(loader.get_single_data())
+    finally:
+        loader.dispose()
+
+    sources = _get_file_ids([filename] + loader.included_files)
+    if use_file_cache and sources is not None:
+        _dump_config_cache(filename, y, sources)
+
+    return sources, y
+
+
+def get_validated_config(filename: Optional[str] = None) -> dict:
     """Read the configuration from file and return it as a dict object.
 
+    Configs are only read again if the config file or one of the files it
+    includes has changed since it has last been read.
+
+    If the environment variable LAUNCHPAD_CFG_CACHE is set to ``1``, the
+    validated configuration is cached in a JSON file next to the config
+    file, which is used as long as the config file and all files it
+    includes are unchanged.
+
     :param filename: Path to configuration file
     :type filename: optional str, default: environment variable LAUNCHPAD_CFG or file ./LAUNCHPAD_CFG.yml
 
     :return: dict with configuration
     :rtype: dict
     """
+    if filename is None:
+        # Read at call time, so that changes after import are respected
+        filename = os.environ.get(CONFIG_ENV_VAR, CONFIG_DEFAULT)
     if filename == CONFIG_DEFAULT:
         logger.warning(
             "Config filename environment variable LAUNCHPAD_CFG not set, "
@@ -69,8 +218,17 @@ def get_validated_config(filename: str = CONFIG_ENV) -> dict:
         )
     logger.info("Loading configuration file %s...", filename)
 
-    with open(filename, encoding="utf-8") as f:
-        return get_validated_config_str(f)
+    key = os.path.abspath(filename)
+    cached = _config_cache.get(key)
+    if cached is not None and _get_file_ids(list(cached[0])) == cached[0]:
+        logger.debug("Configuration %s has not changed", filename)
+        # Callers are free to modify the config they get
+        return pickle.loads(cached[1])  # nosec # pickled by ourselves
+
+    sources, y = _read_config(filename)
+    if sources is not None:
+        _config_cache[key] = sources, pickle.dumps(y)
+    return y
 
 
 def get_validated_config_str(io: Union[AnyStr, TextIO]) -> dict:
@@ -87,9 +245,4 @@ def get_validated_config_str(io: Union[AnyStr, TextIO]) -> dict:
     # is a subclass of yaml.SafeLoader
     y = yaml.load(io, SafeIncludeLoader)  # nosec
 
-    validate_config(y, required_config)
-    check_semantics(y)
-
-    logger.debug("Configuration loaded and validated: %s", y)
-
-    return y
+    return _validated(y)
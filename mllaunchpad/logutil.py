@@ -1,11 +1,10 @@
 # Stdlib imports
+import copy
 import logging
 import logging.config
 import os
 import warnings
-
-# Third-party imports
-import yaml
+from typing import Dict, Tuple
 
 
 LOG_CONF_FILENAME_DEFAULT = "./LAUNCHPAD_LOG.yml"
@@ -13,6 +12,34 @@ LOG_CONF_FILENAME_ENV = os.environ.get(
     "LAUNCHPAD_LOG", LOG_CONF_FILENAME_DEFAULT
 )
 
+_log_config_cache: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
+
+
+def _load_logging_config(filename):
+    """Load the logging configuration file, reusing the previously parsed
+    configuration if the file has not changed since.
+    """
+    try:
+        stat = os.stat(filename)
+        file_id = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        file_id = None  # let open() report any problem
+    cached = _log_config_cache.get(filename)
+    if file_id is not None and cached is not None and cached[0] == file_id:
+        # copy: dictConfig modifies the configuration it is given
+        return copy.deepcopy(cached[1])
+    with open(filename, encoding="utf-8") as file:
+        # Third-party imports
+        import yaml  # only needed if there is a logging config file
+
+        loaded_logging_config = yaml.safe_load(file)
+    if file_id is not None:
+        _log_config_cache[filename] = (
+            file_id,
+            copy.deepcopy(loaded_logging_config),
+        )
+    return loaded_logging_config
+
 
 def init_logging(filename=LOG_CONF_FILENAME_ENV, verbose=False):
     """Only called from wsgi or cli module (mllaunchpad-as-an-app).
@@ -26,9 +53,8 @@ def init_logging(filename=LOG_CONF_FILENAME_ENV, verbose=False):
         action="default", category=DeprecationWarning, module="mllaunchpad.*"
     )
     try:
-        with open(filename, encoding="utf-8") as file:
-            loaded_logging_config = yaml.safe_load(file)
-            logging.config.dictConfig(loaded_logging_config)
+        loaded_logging_config = _load_logging_config(filename)
+        logging.config.dictConfig(loaded_logging_config)
     except FileNotFoundError:
         loaded_logging_config = None
         logging.basicConfig(
@@ -4,10 +4,11 @@
 import logging
 import sys
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import Any, Dict, Iterator, Optional
 
 # Project imports
-from mllaunchpad import resource
+from mllaunchpad import model_interface, resource
 from mllaunchpad.model_interface import ModelInterface, ModelMakerInterface
 
 
@@ -257,6 +258,7 @@ def clear_caches():
     _cached_data_source_sink_tuples.clear()
     _cached_model_makers.clear()
     _cached_model_classes.clear()
+    _find_subclass_cached.cache_clear()
 
 
 def _model_key(model_conf):
@@ -283,6 +285,15 @@ def _find_subclass(module_name, superclass):
 
     __import__(module_name)
 
+    if superclass is ModelMakerInterface:
+        registry = model_interface._MAKER_REGISTRY
+    else:
+        registry = model_interface._MODEL_REGISTRY
+    registered = registry.get(module_name)
+    if registered is not None:
+        logger.debug("Found registered %s class %s", superclass, registered)
+        return registered
+
     classes = superclass.__subclasses__()
     if len(classes) != 1:
         raise ValueError(
@@ -298,6 +309,10 @@ def _find_subclass(module_name, superclass):
     return cls
 
 
+# Shared by all model versions using the same module
+_find_subclass_cached = lru_cache(maxsize=None)(_find_subclass)
+
+
 def _get_model_maker(complete_conf, cache=True):
     """Locate and instantiate class of data-scientist-provided ModelMaker
     (which the data scientist inherited from ModelMakerInterface).
@@ -318,9 +333,8 @@ def _get_model_maker(complete_conf, cache=True):
     mm = _cached_model_makers.get(key)
     if mm is None:
         logger.debug("Locating and instantiating ModelMaker...")
-        mm_cls = _find_subclass(
-            complete_conf["model"]["module"], ModelMakerInterface
-        )
+        find = _find_subclass_cached if cache else _find_subclass
+        mm_cls = find(complete_conf["model"]["module"], ModelMakerInterface)
         mm = mm_cls()
         if cache:
             _cached_model_makers[key] = mm
@@ -349,9 +363,8 @@ def _get_model_class(complete_conf, cache=True):
     m_cls = _cached_model_classes.get(key)
     if m_cls is None:
         logger.debug("Locating Model class...")
-        m_cls = _find_subclass(
-            complete_conf["model"]["module"], ModelInterface
-        )
+        find = _find_subclass_cached if cache else _find_subclass
+        m_cls = find(complete_conf["model"]["module"], ModelInterface)
         if cache:
             _cached_model_classes[key] = m_cls
 
@@ -385,9 +398,10 @@ def _get_model(complete_conf, cache=True):
         logger.info("Loading model...")
         model_wrapper, meta = model_store.load_trained_model(model_conf)
         logger.info(
-            "Model loaded: {}, version: {}, created {}".format(
-                meta["name"], meta["version"], meta["created"]
-            )
+            "Model loaded: %s, version: %s, created %s",
+            meta["name"],
+            meta["version"],
+            meta["created"],
         )
 
         model_tuple = (model_wrapper, meta)
@@ -425,16 +439,12 @@ def _get_data_sources_and_sinks(complete_conf, tags=None, cache=True):
 
 
 def _check_ordered_columns(complete_conf, model_wrapper, what: str, times=1):
-    if (
-        "order_columns_not_used_warning" in complete_conf["model"]
-        and str(
-            complete_conf["model"]["order_columns_not_used_warning"]
-        ).lower()
-        == "never"
-    ):
+    # Cheap checks first, as this runs on every prediction
+    if not model_wrapper.have_columns_been_ordered:
         return
-    if model_wrapper.have_columns_been_ordered:
-        if resource._order_columns_called < times:
+    if resource._order_columns_called < times:
+        warning = complete_conf["model"].get("order_columns_not_used_warning")
+        if str(warning).lower() != "never":
             logger.warning(
                 "Model has been trained on ordered columns, but "
                 "{} does not call function order_columns. {}".format(
@@ -499,10 +509,8 @@ def _add_to_train_report(name: str, value) -> None:
                 "dtypes": [str(dt) for dt in value.dtypes],
                 "description": value.describe(),
             }
-            logger.info(
-                "Train report data: {}={}".format(name, data_dict[name])
-            )
+            logger.info("Train report data: %s=%s", name, data_dict[name])
             _current_train_report["data"] = data_dict
         else:
-            logger.info("Train report: {}={}".format(name, value))
+            logger.info("Train report: %s=%s", name, value)
             _current_train_report[name] = value
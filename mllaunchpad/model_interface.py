@@ -5,6 +5,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Classes registered via @register_model_maker/@register_model, by module name
+_MAKER_REGISTRY = {}
+_MODEL_REGISTRY = {}
+
 
 class ModelMakerInterface(abc.ABC):
     """Abstract model factory interface for Data-Scientist-created models.
@@ -65,6 +69,42 @@ class ModelMakerInterface(abc.ABC):
         """
 
 
+def register_model_maker(cls):
+    """Class decorator to explicitly register your ModelMaker class.
+
+    Optional. Registered classes are looked up directly by module name
+    instead of scanning all subclasses of ModelMakerInterface. Together with
+    :func:`register_model`, this allows more than one model module to be
+    loaded in the same process.
+
+    Example::
+
+        @register_model_maker
+        class MyModelMaker(ModelMakerInterface):
+            ...
+    """
+    _MAKER_REGISTRY[cls.__module__] = cls
+    return cls
+
+
+def register_model(cls):
+    """Class decorator to explicitly register your Model class.
+
+    Optional. Registered classes are looked up directly by module name
+    instead of scanning all subclasses of ModelInterface. Together with
+    :func:`register_model_maker`, this allows more than one model module to
+    be loaded in the same process.
+
+    Example::
+
+        @register_model
+        class MyModel(ModelInterface):
+            ...
+    """
+    _MODEL_REGISTRY[cls.__module__] = cls
+    return cls
+
+
 class ModelInterface(abc.ABC):
     """Abstract model interface for Data-Scientist-created models.
     Please inherit from this class when creating your model to make
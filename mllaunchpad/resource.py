@@ -2,23 +2,40 @@
 import abc
 import getpass
 import glob
+import gzip
 import json
 import logging
+import math
+import mmap
 import os
+import pickle  # nosec # see `_read_model`
 import platform
 import shutil
 import socket
+import struct
 import subprocess  # nosec # We are running a known process using its full path (python -m pip)
 import sys
+import tempfile
+import uuid
 from collections import OrderedDict
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from datetime import time as dt_time
+from datetime import timedelta
+from decimal import Decimal
+from functools import lru_cache
 from time import time
+from types import MappingProxyType
 from typing import (
     Any,
+    Callable,
     Dict,
+    FrozenSet,
     Generator,
     Iterable,
     List,
+    Mapping,
     Optional,
     Tuple,
     Type,
@@ -27,12 +44,17 @@ from typing import (
 )
 
 # Third-party imports
-# We are only unpickling files which are completely under the
-# control of the model developer, not influenced by end user data.
-import dill as pickle  # nosec
+import dill  # nosec
 import numpy as np
 import pandas as pd
 
+
+try:
+    # Third-party imports
+    import orjson  # Optional, for faster metadata reading and writing
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
 # Project imports
 import mllaunchpad as mllp
 
@@ -46,6 +68,237 @@ logger = logging.getLogger(__name__)
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 DATE_FORMAT_FILES = "%Y-%m-%d_%H-%M-%S"
 
+# Suffix of the append-only file of metrics added by `update_model_metrics`
+HISTORY_SUFFIX = ".history.jsonl"
+
+# Model files starting with this marker contain a pickle stream plus its
+# out-of-band buffers (pickle protocol 5), see `_dump_model_file`.
+OOB_MAGIC = b"MLLP-OOB"
+_OOB_COUNT = struct.Struct("<Q")  # number of segments
+_OOB_SEGMENT = struct.Struct("<QQ")  # offset and size of a segment
+_OOB_ALIGNMENT = 64  # segments start at multiples of this (cache line size)
+_OOB_SUPPORTED = sys.version_info >= (3, 8)
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Maximum number of datasources/datasinks which are initialized concurrently
+MAX_INIT_WORKERS = 8
+
+
+@lru_cache(maxsize=None)
+def _get_umask() -> int:
+    """The process' umask, which can only be read by setting it."""
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+@contextmanager
+def _replacing_file(file_name: str, mode: str = "wb", **kwargs):
+    """Open a temporary file which replaces `file_name` once it has been
+    written completely. Readers never see a half-written file, and data which
+    has been memory-mapped from the old file stays valid.
+
+    The file's contents are synced to disk before replacing. To make the
+    replacement itself durable, call `_fsync_dir` after replacing all files.
+    """
+    dir_name, base = os.path.split(file_name)
+    # Unique name, so concurrent writers never write into the same file
+    fd, tmp_name = tempfile.mkstemp(
+        dir=dir_name or ".", prefix=".{}.".format(base), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            if os.name != "nt":
+                # mkstemp only allows access by the owner, but the file should
+                # get the same permissions as other newly created files
+                os.chmod(tmp_name, 0o666 & ~_get_umask())
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, file_name)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Make `dst` a hard link to `src`, or a copy if linking is not possible.
+
+    Linking is safe because model store files are never modified in place,
+    but always replaced by new files (see `_replacing_file`).
+    """
+    try:
+        os.link(src, dst)
+    except OSError:  # e.g. different devices or no support on file system
+        shutil.copyfile(src, dst)
+
+
+def _fsync_dir(path: str) -> None:
+    """Sync the directory entries of `path` (e.g. after renaming files).
+    Not possible (and not needed) on Windows.
+    """
+    if os.name == "nt":
+        return
+    fd = os.open(path or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _json_loads(data: bytes):
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN/Infinity (not standard JSON), try the stdlib
+    return json.loads(data)
+
+
+def _has_non_finite(obj) -> bool:
+    """Whether `obj` contains NaN or (-)Infinity floats."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(val) for val in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(val) for val in obj)
+    return False
+
+
+def _json_dumps(obj, indent: bool = True) -> bytes:
+    """Serialize `obj` as (indented) JSON. Raises TypeError (orjson: a
+    subclass of TypeError) if `obj` contains items which are not serializable.
+
+    NaN and (-)Infinity are written as NaN and (-)Infinity like the standard
+    library does (orjson would write null), whether orjson is used or not.
+    """
+    if orjson is not None and not _has_non_finite(obj):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def _get_current_user() -> str:
+    """Name of the user running this process (which does not change)."""
+    return getpass.getuser()
+
+
+def _pickle_dumps(model, out_of_band: bool) -> Tuple[bytes, List[Any]]:
+    """Pickle `model` using the (fast) standard library pickle, falling back
+    to dill for objects which it cannot handle (e.g. lambdas). Models are
+    always loaded using dill, which reads both kinds of pickles.
+
+    Returns:
+        Tuple of the pickle stream and its out-of-band buffers
+    """
+    buffers: List[Any] = []
+    kwargs = {"buffer_callback": buffers.append} if out_of_band else {}
+    try:
+        stream = pickle.dumps(
+            model, protocol=pickle.HIGHEST_PROTOCOL, **kwargs
+        )
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        logger.debug("Falling back to dill to pickle the model: %s", e)
+        buffers.clear()
+        stream = dill.dumps(model, protocol=pickle.HIGHEST_PROTOCOL, **kwargs)
+    return stream, buffers
+
+
+def _write_model(model, f) -> None:
+    """Pickle `model` into the (binary) file object `f`.
+
+    Where supported, large binary data (e.g. numpy arrays) is not copied
+    into the pickle stream, but handed out-of-band and written as raw blocks
+    after it. The file starts with a table of the segments' offsets and sizes.
+    Segments are aligned, so arrays memory-mapped from them are, too.
+    """
+    if not _OOB_SUPPORTED:
+        f.write(_pickle_dumps(model, out_of_band=False)[0])
+        return
+
+    stream, buffers = _pickle_dumps(model, out_of_band=True)
+    segments = [memoryview(stream)] + [buf.raw() for buf in buffers]
+
+    offset = (
+        len(OOB_MAGIC) + _OOB_COUNT.size + len(segments) * _OOB_SEGMENT.size
+    )
+    table = [OOB_MAGIC, _OOB_COUNT.pack(len(segments))]
+    paddings = []
+    for segment in segments:
+        padding = -offset % _OOB_ALIGNMENT
+        offset += padding
+        paddings.append(bytes(padding))
+        table.append(_OOB_SEGMENT.pack(offset, segment.nbytes))
+        offset += segment.nbytes
+
+    f.write(b"".join(table))
+    for padding, segment in zip(paddings, segments):
+        f.write(padding)
+        f.write(segment)
+
+
+def _dump_model_file(model, file_name: str, compress: int = 0) -> None:
+    """Pickle `model` into the file `file_name`, gzip-compressed with
+    level `compress` (1-9) if it is not 0.
+    """
+    with _replacing_file(file_name) as f:
+        if compress:
+            with gzip.GzipFile(
+                fileobj=f, mode="wb", compresslevel=compress, mtime=0
+            ) as gz:
+                _write_model(model, gz)
+        else:
+            _write_model(model, f)
+
+
+def _read_model(view: memoryview):
+    """Unpickle a model from `view` as written by `_write_model`."""
+    pos = len(OOB_MAGIC)
+    (count,) = _OOB_COUNT.unpack_from(view, pos)
+    pos += _OOB_COUNT.size
+    segments = []
+    for _ in range(count):
+        offset, size = _OOB_SEGMENT.unpack_from(view, pos)
+        pos += _OOB_SEGMENT.size
+        segments.append(view[offset : offset + size])
+
+    # We are only unpickling files which are completely under the
+    # control of the model developer, not influenced by end user data.
+    return dill.loads(segments[0], buffers=segments[1:])  # nosec
+
+
+def _load_model_file(file_name: str):
+    """Unpickle a model written by `_dump_model_file` (or a plain pickle).
+
+    Out-of-band buffers of uncompressed files are memory-mapped
+    (copy-on-write) where possible, so e.g. numpy arrays are backed by
+    the file's pages instead of being copied.
+    """
+    data: Union[mmap.mmap, bytearray]
+    with open(file_name, "rb") as f:
+        magic = f.read(len(OOB_MAGIC))
+        f.seek(0)
+        if magic.startswith(_GZIP_MAGIC):
+            with gzip.GzipFile(fileobj=f, mode="rb") as gz:
+                data = bytearray(gz.read())
+            if not data.startswith(OOB_MAGIC):
+                return dill.loads(data)  # nosec # see `_read_model`
+        elif magic != OOB_MAGIC:
+            return dill.load(f)  # nosec # see `_read_model`
+        elif os.name == "nt":
+            # Windows can't replace a file which is still mapped into memory
+            data = bytearray(os.fstat(f.fileno()).st_size)
+            f.readinto(data)
+        else:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    return _read_model(memoryview(data))
+
 
 class ModelStore:
     """Deals with persisting, loading, updating metrics metadata of models.
@@ -63,54 +316,113 @@ class ModelStore:
         """
         if isinstance(config, dict):
             self.location = config["model_store"]["location"]
+            self.compress = int(config["model_store"].get("compress", 0))
         else:
             self.location = str(config)
+            self.compress = 0
         self.train_report: Dict[str, Any] = {}
+        self._base_names: Dict[Tuple[str, str], str] = {}
+        self._metadata_cache: Dict[str, Tuple[Tuple[int, int], bytes]] = {}
 
     def _ensure_location(self):
-        if not os.path.exists(self.location):
-            os.makedirs(self.location)
+        os.makedirs(self.location, exist_ok=True)
 
     def _get_model_base_name(self, model_conf):
-        return os.path.join(
-            self.location,
-            "{}_{}".format(model_conf["name"], model_conf["version"]),
-        )
+        key = (model_conf["name"], model_conf["version"])
+        if key not in self._base_names:
+            self._base_names[key] = os.path.join(
+                self.location, f"{key[0]}_{key[1]}"
+            )
+        return self._base_names[key]
 
-    @staticmethod
-    def _load_metadata(base_name):
-        metadata_name = base_name + ".json"
-        with open(metadata_name, "r", encoding="utf-8") as f:
-            meta = json.load(f)
+    def _load_metadata(self, base_name):
+        """Load the metadata, only parsing the file again if it has changed.
 
+        Each call returns a new copy, so callers are free to modify it.
+        """
+        metadata_name = base_name + ".json"
+        stat = os.stat(metadata_name)
+        file_id = (stat.st_mtime_ns, stat.st_size)
+        cached = self._metadata_cache.get(metadata_name)
+        if cached is None or cached[0] != file_id:
+            with open(metadata_name, "rb") as f:
+                meta = _json_loads(f.read())
+            self._cache_metadata(metadata_name, file_id, meta)
+            return meta
+
+        # Unpickling is much faster than both parsing JSON and deepcopy
+        return pickle.loads(cached[1])  # nosec # pickled by ourselves
+
+    def _load_metadata_with_history(self, base_name):
+        """Load the metadata including the metrics which have been appended
+        to the history file by `update_model_metrics`.
+        """
+        meta = self._load_metadata(base_name)
+        try:
+            with open(base_name + HISTORY_SUFFIX, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        meta["metrics_history"].update(_json_loads(line))
+        except FileNotFoundError:
+            pass
         return meta
 
-    @staticmethod
-    def _dump_metadata(base_name, raw_metadata):
+    def _append_metrics_history(self, base_name, now_str, metrics):
+        entry = to_plain_python_obj({now_str: metrics})
+        line = _json_dumps(entry, indent=False) + b"\n"
+        with open(base_name + HISTORY_SUFFIX, "ab") as f:
+            f.write(line)
+
+    def _cache_metadata(self, metadata_name, file_id, meta):
+        self._metadata_cache[metadata_name] = (file_id, pickle.dumps(meta))
+
+    def _dump_metadata(self, base_name, raw_metadata):
+        """Atomically replace the metadata file. As it is written last,
+        this also makes an already replaced model file durable.
+        """
         metadata_name = base_name + ".json"
         metadata = to_plain_python_obj(raw_metadata)
-        try:
-            with open(metadata_name, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2)
-        except TypeError as e:
-            os.remove(metadata_name)
-            raise e
+        # Serialize first, so unserializable metadata leaves no broken file
+        contents = _json_dumps(metadata)
+        with _replacing_file(metadata_name) as f:
+            f.write(contents)
+        _fsync_dir(os.path.dirname(metadata_name))
+
+        # Cache what a fresh read would return (e.g. str keys, no tuples)
+        stat = os.stat(metadata_name)
+        self._cache_metadata(
+            metadata_name,
+            (stat.st_mtime_ns, stat.st_size),
+            _json_loads(contents),
+        )
 
-    def _backup_old_model(self, base_name):
+    def _backup_old_model(self, base_name, now: Optional[datetime] = None):
+        if not os.path.exists(base_name + ".pkl"):
+            return  # nothing to back up (e.g. first training of a model)
         backup_dir = os.path.join(self.location, "previous")
-        if not os.path.exists(backup_dir):
-            os.makedirs(backup_dir)
-        infix = datetime.now().strftime(DATE_FORMAT_FILES)
-        for file in glob.glob(base_name + "*"):
+        os.makedirs(backup_dir, exist_ok=True)
+        infix = (now or datetime.now()).strftime(DATE_FORMAT_FILES)
+        location, prefix = os.path.split(base_name)
+        with os.scandir(location) as entries:
+            files = [
+                entry.path
+                for entry in entries
+                if (
+                    os.path.splitext(entry.name)[0] == prefix
+                    or entry.name == prefix + HISTORY_SUFFIX
+                )
+                and entry.is_file()
+            ]
+        for file in files:
             fn_ext = os.path.basename(file)
-            fn, ext = os.path.splitext(fn_ext)
-            new_file_name = "{}_{}{}".format(fn, infix, ext)
+            ext = fn_ext[len(prefix) :]
+            new_file_name = "{}_{}{}".format(prefix, infix, ext)
             logger.debug(
                 "Backing up previous model file {} as {}".format(
                     fn_ext, new_file_name
                 )
             )
-            shutil.copy(file, os.path.join(backup_dir, new_file_name))
+            _link_or_copy(file, os.path.join(backup_dir, new_file_name))
 
     def dump_trained_model(self, complete_conf, model, metrics):
         """Save a model object in the model store. Some metadata will also
@@ -127,21 +439,28 @@ class ModelStore:
         model_conf = complete_conf["model"]
         base_name = self._get_model_base_name(model_conf)
         self._ensure_location()
+        now = datetime.now()
 
         # Check if exists and backup if it does
-        self._backup_old_model(base_name)
+        self._backup_old_model(base_name, now)
 
         # Save model itself
         pkl_name = base_name + ".pkl"
-        with open(pkl_name, "wb") as f:
-            pickle.dump(model, f)
+        _dump_model_file(model, pkl_name, self.compress)
+
+        # A newly trained model starts with a fresh metrics history
+        try:
+            os.remove(base_name + HISTORY_SUFFIX)
+        except FileNotFoundError:
+            pass
 
         # Save metadata
+        now_str = now.strftime(DATE_FORMAT)
         meta = {
             "name": model_conf["name"],
             "version": model_conf["version"],
-            "created": datetime.now().strftime(DATE_FORMAT),
-            "created_by": getpass.getuser(),
+            "created": now_str,
+            "created_by": _get_current_user(),
             "system": {
                 "mllaunchpad_version": mllp.__version__,
                 "platform": platform.platform(),
@@ -154,7 +473,7 @@ class ModelStore:
             },
             "train_report": self.train_report,
             "metrics": metrics,
-            "metrics_history": {datetime.now().strftime(DATE_FORMAT): metrics},
+            "metrics_history": {now_str: metrics},
             "config_snapshot": complete_conf,
         }
         if "api" in complete_conf:  # API is optional
@@ -183,22 +502,24 @@ class ModelStore:
             sys.path.append(".")
 
         pkl_name = base_name + ".pkl"
-        with open(pkl_name, "rb") as f:
-            # We are only unpickling files which are completely under the
-            # control of the model developer, not influenced by end user data.
-            model = pickle.load(f)  # nosec
+        model = _load_model_file(pkl_name)
 
-        meta = self._load_metadata(base_name)
+        meta = self._load_metadata_with_history(base_name)
 
         return model, meta
 
     def update_model_metrics(self, model_conf, metrics):
-        """Update the test metrics for a previously stored model"""
+        """Update the test metrics for a previously stored model.
+
+        The metrics are appended to a separate history file, so that the
+        metadata file does not grow with each update.
+        """
         base_name = self._get_model_base_name(model_conf)
         meta = self._load_metadata(base_name)
         meta["metrics"] = metrics
-        meta["metrics_history"][datetime.now().strftime(DATE_FORMAT)] = metrics
         self._dump_metadata(base_name, meta)
+        now_str = datetime.now().strftime(DATE_FORMAT)
+        self._append_metrics_history(base_name, now_str, metrics)
 
     def add_to_train_report(self, name: str, value):
         plain_val = to_plain_python_obj(value)
@@ -210,7 +531,7 @@ class ModelStore:
         fn_parts = fn.split("_")  # there can be more than two
         name = fn_parts[0]
         version = fn_parts[1]
-        meta = self._load_metadata(base_name)
+        meta = self._load_metadata_with_history(base_name)
         return name, version, meta
 
     def list_models(self):
@@ -273,31 +594,64 @@ class ModelStore:
         return result
 
 
-def _tags_match(tags, other_tags) -> bool:
-    tags = tags or []
+def _as_tag_set(tags) -> FrozenSet[str]:
+    if not tags:
+        return frozenset()
     if isinstance(tags, str):
-        tags = [tags]
+        return frozenset([tags])
+    return frozenset(tags)
 
-    other_tags = other_tags or []
-    if isinstance(other_tags, str):
-        other_tags = [other_tags]
 
-    tags_required = bool(tags)
-    tags_provided = bool(other_tags)
-    tags_matching = bool(set(tags) & set(other_tags))
+def _get_tags_matcher(tags) -> Callable[[Any], bool]:
+    """Get a predicate telling whether a datasource's/datasink's tags
+    match `tags`. Everything matches if no `tags` are required, and
+    untagged datasources/datasinks match any `tags`.
+    """
+    required = _as_tag_set(tags)
+
+    def tags_match(other_tags) -> bool:
+        if not required or not other_tags:
+            return True
+        return not required.isdisjoint(_as_tag_set(other_tags))
 
-    return not tags_required or not tags_provided or tags_matching
+    return tags_match
 
 
-def _get_all_classes(config, the_type: Type[DS]) -> Dict[str, Type[DS]]:
+def _get_all_classes(config, the_type: Type[DS]) -> Mapping[str, Type[DS]]:
+    """Get the lookup table from served types to `the_type`'s subclasses.
+
+    Params:
+        config:    configuration dictionary (only `plugins` is used)
+        the_type:  `DataSource` or `DataSink`
+
+    Returns:
+        read-only dict with keys=served types, values=classes serving them
+    """
+    plugins = tuple(config.get("plugins") or ())
+    table = _get_class_table(
+        the_type, plugins, tuple(the_type.__subclasses__())
+    )
+    return MappingProxyType(table)
+
+
+@lru_cache(maxsize=32)
+def _get_class_table(
+    the_type: Type[DS],
+    plugins: Tuple[str, ...],
+    subclasses: Tuple[Type[DS], ...],
+) -> Dict[str, Type[DS]]:
+    # Cached because importing modules and scanning subclasses is
+    # repeated for every configuration, while the result stays the same.
+    # The current `subclasses` are part of the cache key, so classes
+    # which are defined later lead to a new scan.
     modules = [
         __name__,
         "mllaunchpad.datasources",
     ]  # find built_in types using same mechanism
-    if "plugins" in config:
+    if plugins:
         logger.info("Loading %s plugins", the_type)
         # Append plugins so they can replace builtin types
-        modules += config["plugins"]
+        modules += plugins
 
     ds_cls: Dict[str, Type[DS]] = {}
     for module in modules:
@@ -330,9 +684,7 @@ def _get_all_classes(config, the_type: Type[DS]) -> Dict[str, Type[DS]]:
 def _create_data_sources_or_sinks(
     config: Dict, the_type: Type[DS], tags: Optional[Iterable[str]] = None
 ) -> Dict[str, DS]:
-    # Implementation note: no generator used because we want to fail early
-    if not tags:
-        tags = []
+    tags_match = _get_tags_matcher(tags)
     if the_type == DataSource:
         what = "datasource"
         config_key = "datasources"
@@ -345,17 +697,19 @@ def _create_data_sources_or_sinks(
         )
     ds_objects: Dict[str, DS] = {}
 
-    ds_cls: Dict[str, Type[DS]] = _get_all_classes(config, the_type)
+    ds_cls: Mapping[str, Type[DS]] = _get_all_classes(config, the_type)
     logger.debug("ds_cls=%s", ds_cls)
 
-    if config_key not in config or not isinstance(config[config_key], dict):
+    ds_configs = config.get(config_key)
+    if not isinstance(ds_configs, dict):
         logger.info("No %s defined in configuration", config_key)
         return ds_objects
 
-    for ds_id in config[config_key]:
-        ds_config = config[config_key][ds_id]
+    # Check all configurations before initializing anything (fail early)
+    to_init: List[Tuple[Type[DS], Tuple]] = []
+    for ds_id, ds_config in ds_configs.items():
 
-        if not _tags_match(tags, ds_config.get("tags")):
+        if not tags_match(ds_config.get("tags")):
             continue
 
         ds_types = ds_config["type"].split(".")
@@ -372,17 +726,36 @@ def _create_data_sources_or_sinks(
                 f"No {what} class for {service_need} available. Check the configuration for typos in the {what} type or add a suitable plugin."
             )
 
-        logger.debug(
-            "Initializing %s %s of type %s...", what, ds_id, ds_config["type"]
-        )
         if ds_subtype_config is None:
-            ds_objects[ds_id] = ds_cls[service_need](ds_id, ds_config)
+            args: Tuple = (ds_id, ds_config)
         else:
-            ds_objects[ds_id] = ds_cls[service_need](
-                ds_id, ds_config, ds_subtype_config
-            )
+            args = (ds_id, ds_config, ds_subtype_config)
+        to_init.append((ds_cls[service_need], args))
 
-        logger.debug("%s %s initialized", what.capitalize(), ds_id)
+    def init(cls: Type[DS], args: Tuple) -> DS:
+        logger.debug(
+            "Initializing %s %s of type %s...", what, args[0], args[1]["type"]
+        )
+        ds = cls(*args)
+        logger.debug("%s %s initialized", what.capitalize(), args[0])
+        return ds
+
+    if len(to_init) <= 1 or not config.get("concurrent_init", False):
+        created = [init(cls, args) for cls, args in to_init]
+    else:
+        # Initializing can take a while (e.g. connecting to a database),
+        # but is mostly waiting for I/O, so we initialize concurrently if
+        # configured. Opt-in only, as the objects are created on other
+        # threads than they are used on (e.g. sqlite connections forbid this).
+        workers = min(MAX_INIT_WORKERS, len(to_init))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(init, cls, args) for cls, args in to_init
+            ]
+            created = [future.result() for future in futures]
+
+    for (_, args), ds in zip(to_init, created):
+        ds_objects[args[0]] = ds
 
     # typing.cast(Dict[str, DS], ds_objects)
     return ds_objects
@@ -436,6 +809,45 @@ class CacheDict(OrderedDict):
         return hash(frozenset(self.items()))
 
 
+def _exact_json_default(obj):
+    """`json.dumps` default for values which are commonly used as query
+    params. The encoding is exact (unlike e.g. `repr`, which abbreviates
+    large arrays), so different values never get the same encoding.
+
+    Raises:
+        TypeError if `obj` can't be encoded exactly
+    """
+    if isinstance(obj, np.ndarray):
+        return {
+            "__ndarray__": obj.dtype.str,
+            "shape": obj.shape,
+            "data": obj.tolist(),
+        }
+    if isinstance(obj, np.generic):
+        return {"__type__": type(obj).__name__, "value": obj.item()}
+    if isinstance(obj, (date, dt_time)):  # includes datetime, pd.Timestamp
+        return {"__type__": type(obj).__name__, "value": obj.isoformat()}
+    if isinstance(obj, timedelta):
+        return {
+            "__type__": type(obj).__name__,
+            "value": [obj.days, obj.seconds, obj.microseconds],
+        }
+    if isinstance(obj, (Decimal, uuid.UUID)):
+        return {"__type__": type(obj).__name__, "value": str(obj)}
+    raise TypeError(
+        f"Object of type {type(obj).__name__} can't be encoded exactly"
+    )
+
+
+def params_key(params) -> str:
+    """Exact string representation of `params` for use as a cache key.
+
+    Raises:
+        TypeError if `params` contains values which can't be encoded exactly
+    """
+    return json.dumps(params, sort_keys=True, default=_exact_json_default)
+
+
 class CachedDataSource(type):
     """Metaclass to Auto-apply decorators "@cached" to data getters.
     https://stackoverflow.com/questions/10067262/automatically-decorating-every-instance-method-in-a-class
@@ -460,11 +872,13 @@ class CachedDataSource(type):
                     'To be able to use "chunksize", please set "expires: 0" '
                     "in the datasource configuration."
                 )
-            key = (
-                func.__name__,
-                json.dumps(params, sort_keys=True),
-                chunksize,
-            )
+            try:
+                key = (func.__name__, params_key(params), chunksize)
+            except (TypeError, ValueError) as e:
+                logger.debug(
+                    "Not caching %s of %s: %s", func.__name__, self.id, e
+                )
+                return func(self, params, chunksize)
             item = self._get_cached(key)
             if item is not None:
                 return item
@@ -509,25 +923,38 @@ class DataSource(metaclass=CachedDataSource):
     @abc.abstractmethod
     def get_raw(
         self, params: Dict = None, chunksize: Optional[int] = None
-    ) -> Raw:
+    ) -> Union[Raw, memoryview]:
         ...
 
     def _get_cached(self, key) -> Any:
         if self.expires == -1 or self.expires > 0:
             item, time_stamp = self._cache.get(key, (None, 0))
-            if item is not None and (
-                self.expires == -1 or time() <= time_stamp + self.expires
-            ):
-                logger.debug(
-                    "Returning cached item for datasource %s", self.id
-                )
-                return item
+            if item is not None:
+                if self.expires == -1 or time() <= time_stamp + self.expires:
+                    logger.debug(
+                        "Returning cached item for datasource %s", self.id
+                    )
+                    self._cache.move_to_end(key)  # least recently used last
+                    return item
+                del self._cache[key]  # don't keep expired data in memory
         return None  # either immediately expires (0) or has expired in meantime (>0)
 
     def _to_cache(self, key, item) -> None:
         if self.expires != 0:
+            if self.expires > 0:
+                self._remove_expired()
             self._cache[key] = (item, time())
 
+    def _remove_expired(self) -> None:
+        oldest_valid = time() - self.expires
+        expired = [
+            key
+            for key, (_, time_stamp) in self._cache.items()
+            if time_stamp < oldest_valid
+        ]
+        for key in expired:
+            del self._cache[key]
+
     def __del__(self):
         """Overwrite to clean up any resources (connections, temp files, etc.)."""
         ...
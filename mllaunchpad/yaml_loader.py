@@ -1,30 +1,105 @@
 # Stdlib imports
 import os
+import pickle  # nosec # only used to copy included data in memory
+from typing import Dict, List, Tuple
 
 # Third-party imports
 import yaml
 
 
-class SafeIncludeLoader(yaml.SafeLoader):
-    """A subclass of SafeLoader which supports !include file references."""
+try:
+    # The libyaml-based loader is considerably faster, if available
+    _SafeLoader = yaml.CSafeLoader
+except AttributeError:  # pragma: no cover
+    _SafeLoader = yaml.SafeLoader  # type: ignore
 
-    def __init__(self, stream):
-        if isinstance(stream, str) or isinstance(stream, bytes):
+
+# Parsed included files by absolute file name: modification times and sizes
+# of the file and the files it includes, the pickled data and the files it
+# includes. Unchanged files don't need to be parsed again.
+_include_cache: Dict[
+    str, Tuple[List[Tuple[str, Tuple[int, int]]], bytes, List[str]]
+] = {}
+
+
+def _get_file_id(filename: str) -> Tuple[int, int]:
+    stat = os.stat(filename)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _is_unchanged(file_ids: List[Tuple[str, Tuple[int, int]]]) -> bool:
+    try:
+        return all(_get_file_id(fn) == file_id for fn, file_id in file_ids)
+    except OSError:
+        return False
+
+
+class SafeIncludeLoader(_SafeLoader):  # type: ignore
+    """A subclass of SafeLoader (or CSafeLoader if PyYAML has been built with
+    libyaml) which supports !include file references.
+    """
+
+    def __init__(self, stream, root=None):
+        if root is not None:
+            # Directory to resolve included files against
+            self._root = root
+        elif isinstance(stream, str) or isinstance(stream, bytes):
             # Loading config from string
             self._root = "."
         else:
             # Loading config from file
             self._root = os.path.split(stream.name)[0]
+        # All files included so far, including those included indirectly
+        self.included_files = []
 
         super().__init__(stream)
 
     def include(self, node):
         filename = os.path.join(self._root, self.construct_scalar(node))
+        key = os.path.abspath(filename)
+
+        cached = _include_cache.get(key)
+        if cached is not None and _is_unchanged(cached[0]):
+            data = pickle.loads(cached[1])  # nosec # pickled by ourselves
+            included_files = cached[2]
+        else:
+            data, included_files = self._load_include(filename, key)
+
+        self.included_files.append(filename)
+        self.included_files.extend(included_files)
+        return data
+
+    @staticmethod
+    def _load_include(filename, key):
+        try:
+            # Before reading, so that changes while reading are noticed later
+            file_id = _get_file_id(filename)
+        except OSError:
+            file_id = None
+        with open(filename, "rb") as f:
+            raw = f.read()
+        # Same as yaml.load(f, Loader=SafeIncludeLoader), but we need to
+        # know about the files which the included file includes.
+        loader = SafeIncludeLoader(raw, root=os.path.dirname(filename))
+        try:
+            data = loader.get_single_data()
+        finally:
+            loader.dispose()
 
-        with open(filename, "r", encoding="utf-8") as f:
-            # Normally, one should use safe_load(), but our Loader
-            # is a subclass of yaml.SafeLoader
-            return yaml.load(f, Loader=SafeIncludeLoader)  # nosec
+        if file_id is not None:
+            try:
+                file_ids = [(filename, file_id)] + [
+                    (fn, _get_file_id(fn)) for fn in loader.included_files
+                ]
+            except OSError:
+                pass
+            else:
+                _include_cache[key] = (
+                    file_ids,
+                    pickle.dumps(data),
+                    loader.included_files,
+                )
+        return data, loader.included_files
 
 
 SafeIncludeLoader.add_constructor("!include", SafeIncludeLoader.include)
@@ -1,6 +1,7 @@
 """Tests for `mllaunchpad.api` module."""
 
 # Stdlib imports
+from types import SimpleNamespace
 from unittest import mock
 
 # Third-party imports
@@ -260,6 +261,42 @@ def test_model_modelapi_illegal_resource_combinations(
     load_model_mock.assert_called_once_with(minimal_config["model"])
 
 
+@pytest.mark.parametrize(
+    "raml, expected_classes",
+    [
+        (raml_head_str + raml_query_resource_str, [api.QueryResource]),
+        (raml_head_str + raml_file_resource_str, [api.FileUploadResource]),
+        (
+            raml_head_str + raml_query_resource_str + raml_file_resource_str,
+            [api.QueryResource, api.FileUploadResource],
+        ),
+        (
+            raml_head_str
+            + raml_file_resource_str
+            + raml_query_resource_str.replace("/something:", ""),
+            [api.QueryOrFileUploadResource],
+        ),
+    ],
+)
+@mock.patch("mllaunchpad.api.Api", autospec=True)
+@mock.patch(
+    "mllaunchpad.resource.ModelStore.load_trained_model",
+    side_effect=lambda _: load_model_result(minimal_config),
+)
+def test_model_modelapi_resource_classes(
+    load_model_mock, api_mock, raml, expected_classes, app
+):
+    """Should only use the combined resource class if URLs coincide."""
+    with mock.patch(
+        "ramlfications.parse",
+        autospec=True,
+        side_effect=lambda _: parsed_raml(raml),
+    ):
+        _ = api.ModelApi(minimal_config, app)
+    add_resource = api_mock.return_value.add_resource
+    assert [c[0][0] for c in add_resource.call_args_list] == expected_classes
+
+
 @mock.patch(
     "ramlfications.parse",
     autospec=True,
@@ -317,6 +354,109 @@ def test_model_modelapi_predict_using_model(
     assert output == prediction_output
 
 
+def _mock_param(name, type_="string", repeat=False):
+    return SimpleNamespace(
+        name=name,
+        type=type_,
+        repeat=repeat,
+        required=False,
+        default=None,
+        enum=None,
+        description="desc",
+    )
+
+
+def _mock_resource(query_params, form_params=None):
+    return SimpleNamespace(
+        query_params=query_params,
+        form_params=form_params,
+        uri_params=None,
+        body=None,
+    )
+
+
+def test_create_request_parser_repeated_param():
+    """Should register a repeated parameter only once."""
+    res = _mock_resource([_mock_param("a")], [_mock_param("a", repeat=True)])
+    parser = api._create_request_parser(res)
+    args = [arg for arg in parser.args if arg.name == "a"]
+    assert len(args) == 1
+    assert args[0].action == "append"
+
+
+def test_create_request_parser_duplicate_param():
+    res = _mock_resource([_mock_param("a"), _mock_param("a")])
+    with pytest.raises(ValueError, match="same name"):
+        api._create_request_parser(res)
+
+
+def test_create_request_parser_unsupported_type():
+    res = _mock_resource([_mock_param("a", type_="date")])
+    with pytest.raises(ValueError, match="Unsupported type date"):
+        api._create_request_parser(res)
+
+
+def test_parse_raml_cached(tmp_path):
+    """Should parse an unchanged RAML file only once."""
+    raml_file = tmp_path / "my.raml"
+    raml_file.write_text(minimal_raml_str)
+    api._parse_raml_cached.cache_clear()
+    with mock.patch(
+        "ramlfications.parse",
+        autospec=True,
+        side_effect=lambda _: parsed_raml(minimal_raml_str),
+    ) as parse:
+        first = api._parse_raml(str(raml_file))
+        second = api._parse_raml(str(raml_file))
+        assert first is second
+        parse.assert_called_once_with(str(raml_file))
+
+        raml_file.write_text(minimal_raml_str + "\n")
+        api._parse_raml(str(raml_file))
+        assert parse.call_count == 2
+    api._parse_raml_cached.cache_clear()
+
+
+def test_generate_raml_deterministic():
+    df = pd.DataFrame({"c1": range(100)}, index=range(100, 200))
+    out = api.generate_raml(minimal_config, data_frame=df)
+    assert out == api.generate_raml(minimal_config, data_frame=df)
+    assert "example: 0" in out
+
+    with pytest.raises(ValueError, match="empty"):
+        api.generate_raml(minimal_config, data_frame=df.iloc[:0])
+
+
+def test_generate_raml_types():
+    df = pd.DataFrame(
+        {
+            "i": pd.Series([1], dtype="int32"),
+            "f": pd.Series([1.5], dtype="float32"),
+            "b": [True],
+            "s": ["a"],
+            "d": pd.to_datetime(["2020-01-01"]),
+            "c": pd.Categorical(["x"]),
+        }
+    )
+
+    out = api.generate_raml(minimal_config, data_frame=df)
+
+    types = [
+        line.split(":")[1].strip()
+        for line in out.splitlines()
+        if line.strip().startswith("type:")
+    ]
+    assert types == [
+        "integer",
+        "number",
+        "boolean",
+        "string",
+        "date",
+        "string",
+    ]
+    assert "enum: ['x']" in out
+
+
 def test_generate_raml():
     df = pd.DataFrame({"c1": [1, 2, 3], "c2": ["a", "b", "c"]})
 
@@ -30,6 +30,22 @@ def test_dunder_main():
     import mllaunchpad.__main__  # noqa: F401
 
 
+@pytest.mark.parametrize(
+    "module", ["mllaunchpad.api", "flask", "pandas", "yaml"]
+)
+def test_lazy_imports(module):
+    """The CLI should not import heavy dependencies unless needed."""
+    # Stdlib imports
+    import subprocess  # nosec
+    import sys
+
+    code = "import sys, mllaunchpad.cli; print({!r} in sys.modules)".format(
+        module
+    )
+    out = subprocess.check_output([sys.executable, "-c", code])  # nosec
+    assert out.strip() == b"False"
+
+
 def test_no_command():
     """Test the Command Line Interface without any arguments."""
     runner = CliRunner()
@@ -80,6 +96,39 @@ def test_train_cfg_log_config_verbose(
     init_logging_mock.assert_called_with(verbose=True)
 
 
+@mock.patch("{}.logutil.init_logging".format(cli.__name__))
+@mock.patch(
+    "{}.mllp.train_model".format(cli.__name__), return_value=("", "my_metrics")
+)
+@mock.patch(
+    "{}.mllp.get_validated_config".format(cli.__name__),
+    return_value="my_config",
+)
+def test_config_envvar(get_cfg, train, init_logging_mock, runner_cfg_logcfg):
+    """The config file can be given by the LAUNCHPAD_CFG env var."""
+    runner, cfg, _ = runner_cfg_logcfg
+
+    result = runner.invoke(cli.main, ["train"], env={"LAUNCHPAD_CFG": cfg})
+    assert result.exit_code == 0
+    get_cfg.assert_called_with(cfg)
+
+    result = runner.invoke(
+        cli.main, ["train"], env={"LAUNCHPAD_CFG": "does_not_exist.yml"}
+    )
+    assert result.exit_code != 0
+    assert "does not exist" in result.stderr
+    train.assert_called_once()
+
+    # Only checked when the config is actually needed
+    result = runner.invoke(
+        cli.main,
+        ["train", "--help"],
+        env={"LAUNCHPAD_CFG": "does_not_exist.yml"},
+    )
+    assert result.exit_code == 0
+    train.assert_called_once()
+
+
 @mock.patch(
     "{}.mllp.retest".format(cli.__name__), return_value=("", "my_metrics")
 )
@@ -99,8 +148,8 @@ def test_retest(get_cfg, retest, runner_cfg_logcfg):
 
 
 @mock.patch("{}.Settings.config".format(cli.__name__))
-@mock.patch("{}.Flask".format(cli.__name__))
-@mock.patch("{}.ModelApi".format(cli.__name__))
+@mock.patch("flask.Flask")
+@mock.patch("mllaunchpad.api.ModelApi")
 def test_api(ma, flask, config, runner_cfg_logcfg, caplog):
     """Test the CLI api startup."""
     runner, cfg, _ = runner_cfg_logcfg
@@ -142,7 +191,7 @@ def test_predict(config, predict, runner_cfg_logcfg):
     assert "my_prediction" in result.output
 
 
-@mock.patch("{}.generate_raml".format(cli.__name__), return_value="my_raml")
+@mock.patch("mllaunchpad.api.generate_raml", return_value="my_raml")
 @mock.patch("{}.Settings.config".format(cli.__name__))
 def test_generate_raml(config, raml, runner_cfg_logcfg):
     """Test the RAML generation from CLI."""
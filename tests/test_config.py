@@ -46,6 +46,21 @@ def test_get_config_default_warning(caplog):
         assert "not set".lower() in caplog.text.lower()
 
 
+def test_get_config_env_var(monkeypatch, tmp_path, caplog):
+    """LAUNCHPAD_CFG is read when the config is requested, not on import."""
+    cfg_file = tmp_path / "cfg.yml"
+    cfg_file.write_bytes(test_file_valid)
+    monkeypatch.setenv("LAUNCHPAD_CFG", str(cfg_file))
+    cfg = config.get_validated_config()
+    assert cfg["api"]["name"] == "my_api"
+    assert "not set" not in caplog.text.lower()
+
+
+def test_config_env_deprecated_alias():
+    """CONFIG_ENV is kept for backwards compatibility"""
+    assert isinstance(config.CONFIG_ENV, str)
+
+
 def test_get_config_invalid():
     """Test config validation."""
     test_file_invalid = b"""
@@ -66,6 +81,24 @@ def test_get_config_invalid():
             _ = config.get_validated_config("lalala")
 
 
+@pytest.mark.parametrize(
+    "replace, replacement, missing",
+    [
+        (b"  version: '0.1.2'\n", b"", "model:version"),
+        (b"    location: asdfasdf\n", b"", "model_store:location"),
+        (
+            b"model_store:\n    location: asdfasdf",
+            b"model_store: x",
+            "model_store:location",
+        ),
+    ],
+)
+def test_validate_config_missing_key(replace, replacement, missing):
+    test_file = test_file_valid.replace(replace, replacement)
+    with pytest.raises(ValueError, match="Missing key.*: {}$".format(missing)):
+        config.get_validated_config_str(test_file)
+
+
 def test_get_validated_config_str(caplog):
     cfg = config.get_validated_config_str(test_file_valid)
     assert cfg["api"]["name"] == "my_api"
@@ -109,6 +142,59 @@ def test_yaml_include(mo):
         assert cfg["dbms"]["xob10"]["type"] == "oracle"
 
 
+def test_get_config_cached(tmp_path, monkeypatch):
+    """Should reuse the JSON cache until the config or an include changes."""
+    monkeypatch.setenv(config.CONFIG_CACHE_ENV, "1")
+    cfg_file = tmp_path / "cfg.yml"
+    cfg_file.write_bytes(test_file_yaml)
+    (tmp_path / "test").write_bytes(test)
+    cache_file = tmp_path / ("cfg.yml" + config.CONFIG_CACHE_SUFFIX)
+
+    cfg = config.get_validated_config(str(cfg_file))
+    assert cache_file.exists()
+    config.clear_config_cache()  # only use the JSON cache
+    with mock.patch("{}.SafeIncludeLoader".format(config.__name__)) as ldr:
+        assert config.get_validated_config(str(cfg_file)) == cfg
+    ldr.assert_not_called()
+
+    (tmp_path / "test").write_bytes(test.replace(b"oracle", b"sqlite_db"))
+    cfg = config.get_validated_config(str(cfg_file))
+    assert cfg["dbms"]["xob10"]["type"] == "sqlite_db"
+
+
+def test_get_config_memoized(tmp_path):
+    cfg_file = tmp_path / "cfg.yml"
+    cfg_file.write_bytes(test_file_valid)
+    config.clear_config_cache()
+
+    cfg = config.get_validated_config(str(cfg_file))
+    cfg["model"]["name"] = "changed"  # must not affect the cached config
+    with mock.patch("{}.SafeIncludeLoader".format(config.__name__)) as ldr:
+        cfg = config.get_validated_config(str(cfg_file))
+    ldr.assert_not_called()
+    assert cfg["model"]["name"] == "my_model"
+
+    cfg_file.write_bytes(test_file_valid.replace(b"my_model", b"other_model"))
+    cfg = config.get_validated_config(str(cfg_file))
+    assert cfg["model"]["name"] == "other_model"
+    config.clear_config_cache()
+
+
+def test_get_config_not_cached(tmp_path, monkeypatch):
+    """Should not cache without opting in, or what JSON cannot represent."""
+    cfg_file = tmp_path / "cfg.yml"
+    cfg_file.write_bytes(test_file_valid)
+    cache_file = tmp_path / ("cfg.yml" + config.CONFIG_CACHE_SUFFIX)
+    monkeypatch.delenv(config.CONFIG_CACHE_ENV, raising=False)
+    config.get_validated_config(str(cfg_file))
+    assert not cache_file.exists()
+
+    monkeypatch.setenv(config.CONFIG_CACHE_ENV, "1")
+    cfg_file.write_bytes(test_file_valid + b"\ncreated: 2020-01-01\n")
+    config.get_validated_config(str(cfg_file))
+    assert not cache_file.exists()
+
+
 api_version_deprecation_file = """
 blabla:
     - asdf
@@ -1,6 +1,11 @@
 # Stdlib imports
+import logging
 import os
+import pickle
+import shutil
+import sqlite3
 import sys
+from datetime import date
 from io import BytesIO
 from unittest import mock
 
@@ -89,6 +94,55 @@ def test_filedatasource_df_dtypes(file_type, filedatasource_cfg_and_file):
     assert str(df["d"].dtype) == "float64"
 
 
+def test_read_dtypes():
+    dtfile = BytesIO(b"columns,dtypes\na,str\nb,datetime\nc,float64\n")
+    dtypes, parse_dates = mllp_ds._read_dtypes(dtfile)
+    assert dtypes == {"a": "str", "c": "float64"}
+    assert parse_dates == ["b"]
+
+
+def test_read_dtypes_cached(tmp_path):
+    dtypes_path = str(tmp_path / "some_file.dtypes")
+    with open(dtypes_path, "w") as f:
+        f.write("columns,dtypes\na,str\n")
+    with mock.patch.dict(mllp_ds._dtypes_cache, clear=True):
+        with mock.patch("pandas.read_csv", wraps=pd.read_csv) as read_csv:
+            dtypes1, _ = mllp_ds._read_dtypes(dtypes_path)
+            dtypes1["b"] = "int64"  # must not affect the cached dtypes
+            dtypes2, _ = mllp_ds._read_dtypes(dtypes_path)
+            assert read_csv.call_count == 1
+            assert dtypes2 == {"a": "str"}
+
+            with open(dtypes_path, "w") as f:
+                f.write("columns,dtypes\na,float64\n")
+            dtypes3, _ = mllp_ds._read_dtypes(dtypes_path)
+            assert read_csv.call_count == 2
+            assert dtypes3 == {"a": "float64"}
+
+
+@pytest.mark.parametrize(
+    "options, chunksize, expected_engine",
+    [
+        ({}, None, None),
+        ({}, 10, None),
+        ({"engine": "pyarrow"}, None, "pyarrow"),
+        ({"engine": "pyarrow"}, 10, None),
+        ({"engine": "c"}, 10, "c"),
+    ],
+)
+@mock.patch("pandas.read_csv")
+def test_filedatasource_df_engine(
+    read_csv, options, chunksize, expected_engine
+):
+    """The pyarrow engine is only used if configured"""
+    cfg = {"type": "csv", "path": "some_file.csv", "options": options}
+    ds = mllp_ds.FileDataSource("bla", cfg)
+    ds.get_dataframe(chunksize=chunksize)
+    read_csv.assert_called_once()
+    assert read_csv.call_args[1].get("engine") == expected_engine
+    assert ds.options == options
+
+
 def test_filedatasource_df_chunksize(filedatasource_cfg_and_file):
     cfg, file = filedatasource_cfg_and_file("csv")
     cfg["path"] = BytesIO(file)  # sort-of mocking the file for pandas to open
@@ -116,6 +170,26 @@ def test_filedatasource_raw(file_type, filedatasource_cfg_and_file):
             assert False  # Unsupported type
 
 
+@pytest.mark.parametrize("data", [b"Hello world!", b""])
+def test_filedatasource_raw_memory_map(data, tmp_path):
+    path = tmp_path / "some_file.bin"
+    path.write_bytes(data)
+    cfg = {"type": "binary_file", "path": str(path), "memory_map": True}
+    ds = mllp_ds.FileDataSource("bla", cfg)
+    raw = ds.get_raw()
+    assert isinstance(raw, memoryview)
+    assert raw.readonly
+    assert raw == data
+
+
+def test_filedatasource_raw_memory_map_unpickle(tmp_path):
+    path = tmp_path / "some_file.pickle"
+    path.write_bytes(pickle.dumps({"my": "object"}))
+    cfg = {"type": "binary_file", "path": str(path), "memory_map": True}
+    ds = mllp_ds.FileDataSource("bla", cfg)
+    assert pickle.loads(ds.get_raw()) == {"my": "object"}
+
+
 def test_filedatasource_notimplemented(filedatasource_cfg_and_file):
     cfg, _ = filedatasource_cfg_and_file("csv")
     ds = mllp_ds.FileDataSource("bla", cfg)
@@ -201,6 +275,52 @@ def test_filedatasink_df_dtypes(
     assert to_csv_mock.call_count == 2
 
 
+def test_filedatasink_df_chunksize(tmp_path, filedatasink_cfg_and_data):
+    cfg, data = filedatasink_cfg_and_data("csv")
+    cfg["path"] = str(tmp_path / "some_file.csv")
+    ds = mllp_ds.FileDataSink("bla", cfg)
+    ds.put_dataframe(data, chunksize=1)
+    pd.testing.assert_frame_equal(pd.read_csv(cfg["path"]), data)
+    with mock.patch("pandas.DataFrame.to_csv") as to_csv_mock:
+        ds.put_dataframe(data, chunksize=1)
+    to_csv_mock.assert_called_once_with(cfg["path"], index=False, chunksize=1)
+
+
+def test_filedatasink_df_gzip(tmp_path, filedatasink_cfg_and_data):
+    cfg, data = filedatasink_cfg_and_data("csv")
+    cfg["path"] = str(tmp_path / "some_file.csv.gz")
+    ds = mllp_ds.FileDataSink("bla", cfg)
+    ds.put_dataframe(data)
+    pd.testing.assert_frame_equal(pd.read_csv(cfg["path"]), data)
+    with mock.patch("pandas.DataFrame.to_csv") as to_csv_mock:
+        ds.put_dataframe(data)
+    to_csv_mock.assert_called_once_with(
+        cfg["path"], index=False, compression=mllp_ds.GZIP_COMPRESSION
+    )
+
+
+def test_filedatasink_df_dtypes_file(tmp_path):
+    cfg = {
+        "type": "csv",
+        "path": str(tmp_path / "some_file.csv"),
+        "dtypes_path": str(tmp_path / "some_file.dtypes"),
+    }
+    data = pd.DataFrame(
+        {"a": [1], "b": ["x"], "c": [pd.Timestamp("2020-01-01")], "d": [0.5]}
+    )
+    mllp_ds.FileDataSink("bla", cfg).put_dataframe(data)
+    with open(cfg["dtypes_path"]) as f:
+        assert f.read().splitlines() == [
+            "columns,dtypes",
+            "a,int64",
+            "b,str",
+            "c,datetime",
+            "d,float64",
+        ]
+    df = mllp_ds.FileDataSource("bla", cfg).get_dataframe()
+    pd.testing.assert_frame_equal(df, data)
+
+
 @mock.patch("pandas.DataFrame.to_csv")
 def test_filedatasink_df_options(to_csv_mock, filedatasink_cfg_and_data):
     options = {"index": True, "sep": "?"}
@@ -226,13 +346,42 @@ def test_filedatasink_raw(file_type, mode, filedatasink_cfg_and_data):
             mo.assert_called_once_with(cfg["path"], mode)
 
 
+@pytest.mark.parametrize("options", [{}, {"buffering": 0}])
+def test_filedatasink_raw_copy_file(tmp_path, options):
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"some\x00contents")
+    cfg = {
+        "type": "binary_file",
+        "path": str(tmp_path / "sub" / "target.bin"),
+        "options": options,
+    }
+    ds = mllp_ds.FileDataSink("bla", cfg)
+    with mock.patch(
+        "{}.shutil.copyfile".format(mllp_ds.__name__),
+        wraps=mllp_ds.shutil.copyfile,
+    ) as copyfile:
+        ds.put_raw(source)
+    assert copyfile.called == (not options)
+    with open(cfg["path"], "rb") as f:
+        assert f.read() == b"some\x00contents"
+
+
+def test_filedatasink_raw_copy_file_text(tmp_path):
+    """Text files are written with their encoding, so can't be copied"""
+    source = tmp_path / "source.txt"
+    source.write_text("Hello world!")
+    cfg = {"type": "text_file", "path": str(tmp_path / "target.txt")}
+    ds = mllp_ds.FileDataSink("bla", cfg)
+    with pytest.raises(TypeError, match="binary_file"):
+        ds.put_raw(source)
+    assert not os.path.exists(cfg["path"])
+
+
 def test_filedatasink_notimplemented(filedatasink_cfg_and_data):
     cfg, data = filedatasink_cfg_and_data("csv")
     ds = mllp_ds.FileDataSink("bla", cfg)
     with pytest.raises(NotImplementedError):
         ds.put_dataframe(data, params={"a": "hallo"})
-    with pytest.raises(NotImplementedError):
-        ds.put_dataframe(data, chunksize=5)
     with pytest.raises(TypeError, match="put_dataframe"):
         ds.put_raw(data)
 
@@ -251,31 +400,50 @@ def test_filedatasink_notimplemented(filedatasink_cfg_and_data):
 
 
 @mock.patch("os.makedirs")
-@mock.patch("os.path.exists", return_value=False)
 @mock.patch("pandas.DataFrame.to_csv")
 def test_filedatasink_df_ensure_path(
-    to_csv_mock, exists_mock, makedirs_mock, filedatasink_cfg_and_data
+    to_csv_mock, makedirs_mock, filedatasink_cfg_and_data, caplog
 ):
     cfg, data = filedatasink_cfg_and_data("csv")
     cfg["path"] = os.path.join("bla/foo", cfg["path"])
     ds = mllp_ds.FileDataSink("bla", cfg)
-    ds.put_dataframe(data)
-    exists_mock.assert_called_once()
+    with caplog.at_level(logging.INFO):
+        ds.put_dataframe(data)
     makedirs_mock.assert_called_once_with("bla/foo")
+    assert "created missing path" in caplog.text.lower()
 
+    ds.put_dataframe(data)  # directory is only ensured once
+    makedirs_mock.assert_called_once()
 
-@mock.patch("os.makedirs")
-@mock.patch("os.path.exists", return_value=True)
+
+@mock.patch("os.makedirs", side_effect=FileExistsError)
 @mock.patch("pandas.DataFrame.to_csv")
 def test_filedatasink_df_ensure_path_noexist(
-    to_csv_mock, exists_mock, makedirs_mock, filedatasink_cfg_and_data
+    to_csv_mock, makedirs_mock, filedatasink_cfg_and_data, caplog
 ):
     cfg, data = filedatasink_cfg_and_data("csv")
     cfg["path"] = os.path.join("bla/foo", cfg["path"])
     ds = mllp_ds.FileDataSink("bla", cfg)
-    ds.put_dataframe(data)
-    exists_mock.assert_called_once()
-    makedirs_mock.assert_not_called()
+    with caplog.at_level(logging.INFO):
+        ds.put_dataframe(data)
+    makedirs_mock.assert_called_once_with("bla/foo")
+    to_csv_mock.assert_called_once()
+    assert "created missing path" not in caplog.text.lower()
+
+
+@pytest.mark.parametrize("file_type", ["csv", "text_file"])
+def test_filedatasink_recreates_removed_path(
+    file_type, filedatasink_cfg_and_data, tmp_path
+):
+    """Directories removed after the first write are created again"""
+    cfg, data = filedatasink_cfg_and_data(file_type)
+    cfg["path"] = str(tmp_path / "bla" / "foo" / "out.txt")
+    ds = mllp_ds.FileDataSink("bla", cfg)
+    put = ds.put_dataframe if file_type == "csv" else ds.put_raw
+    put(data)
+    shutil.rmtree(str(tmp_path / "bla"))
+    put(data)
+    assert os.path.exists(cfg["path"])
 
 
 # OracleDataSource
@@ -305,6 +473,15 @@ def oracledatasource_cfg_and_data():
     return _inner
 
 
+@mock.patch.dict(sys.modules, {"cx_Oracle": None})
+def test_oracledatasource_missing_package(oracledatasource_cfg_and_data):
+    cfg, dbms_cfg, _ = oracledatasource_cfg_and_data()
+    with mock.patch("{}.logger".format(mllp_ds.__name__)) as logger:
+        with pytest.raises(ModuleNotFoundError):
+            mllp_ds.OracleDataSource("bla", cfg, dbms_cfg)
+    assert "cx_Oracle" in logger.error.call_args[0][0]
+
+
 @mock.patch("pandas.read_sql")
 @mock.patch(
     "{}.get_user_pw".format(mllp_ds.__name__), return_value=("foo", "bar")
@@ -326,6 +503,168 @@ def test_oracledatasource_df(user_pw, pd_read, oracledatasource_cfg_and_data):
     del sys.modules["cx_Oracle"]
 
 
+@pytest.mark.parametrize(
+    "expires, later, expected_reads",
+    [(0, 0, 2), (100, 10, 1), (100, 1000, 2), (-1, 1000, 1)],
+)
+@mock.patch("pandas.read_sql")
+@mock.patch(
+    "{}.get_user_pw".format(mllp_ds.__name__), return_value=("foo", "bar")
+)
+def test_oracledatasource_df_cache_dir(
+    user_pw,
+    pd_read,
+    expires,
+    later,
+    expected_reads,
+    oracledatasource_cfg_and_data,
+    tmp_path,
+):
+    """Query results in cache_dir should be reused by new datasources."""
+    cfg, dbms_cfg, data = oracledatasource_cfg_and_data()
+    cfg["cache_dir"] = str(tmp_path / "cache")
+    cfg["expires"] = expires
+    sys.modules["cx_Oracle"] = mock.MagicMock()
+    pd_read.side_effect = lambda *args, **kwargs: data.copy()
+
+    df1 = mllp_ds.OracleDataSource("bla", cfg, dbms_cfg).get_dataframe()
+    with mock.patch(
+        "{}.time".format(mllp_ds.__name__),
+        return_value=mllp_ds.time() + later,
+    ):
+        ds = mllp_ds.OracleDataSource("bla", cfg, dbms_cfg)
+        df2 = ds.get_dataframe()
+
+    pd.testing.assert_frame_equal(df1, data)
+    pd.testing.assert_frame_equal(df2, data)
+    assert pd_read.call_count == expected_reads
+    if expires == 0:
+        assert not os.path.exists(cfg["cache_dir"])
+    else:
+        assert len(os.listdir(cfg["cache_dir"])) == 1
+
+    del sys.modules["cx_Oracle"]
+
+
+@mock.patch(
+    "{}.get_user_pw".format(mllp_ds.__name__), return_value=("foo", "bar")
+)
+def test_oracledatasource_cache_file_key(
+    user_pw, oracledatasource_cfg_and_data, tmp_path
+):
+    """Cache files must depend on params (incl. dates) and read options."""
+    cfg, dbms_cfg, _ = oracledatasource_cfg_and_data()
+    cfg["cache_dir"] = str(tmp_path / "cache")
+    cfg["expires"] = -1
+    sys.modules["cx_Oracle"] = mock.MagicMock()
+    ds = mllp_ds.OracleDataSource("bla", cfg, dbms_cfg)
+
+    day1 = {"day": date(2020, 1, 1)}
+    day2 = {"day": date(2020, 1, 2)}
+    file1 = ds._get_cache_file("q", day1, 1000)
+    assert file1 == ds._get_cache_file("q", dict(day1), 1000)
+    assert file1 != ds._get_cache_file("q", day2, 1000)
+    assert file1 != ds._get_cache_file("q", day1, 500)
+    ds.options = {"coerce_float": False}
+    assert file1 != ds._get_cache_file("q", day1, 1000)
+    assert ds._get_cache_file("q", {"obj": object()}, 1000) is None
+
+    del sys.modules["cx_Oracle"]
+
+
+@pytest.mark.filterwarnings("ignore:pandas only support")
+def test_arraysize_connection():
+    """Cursors should fetch the configured number of rows per round-trip."""
+    connection = sqlite3.connect(":memory:")
+    wrapped = mllp_ds._ArraysizeConnection(connection, 7)
+    assert wrapped.cursor().arraysize == 7
+    df = pd.read_sql("SELECT 1 AS a UNION SELECT 2", con=wrapped)
+    assert list(df["a"]) == [1, 2]
+    wrapped.close()
+
+
+@pytest.mark.parametrize("arraysize", [None, 50])
+@mock.patch("pandas.read_sql")
+@mock.patch(
+    "{}.get_user_pw".format(mllp_ds.__name__), return_value=("foo", "bar")
+)
+def test_oracledatasource_arraysize(
+    user_pw, pd_read, arraysize, oracledatasource_cfg_and_data
+):
+    cfg, dbms_cfg, data = oracledatasource_cfg_and_data()
+    if arraysize:
+        cfg["arraysize"] = arraysize
+    ora_mock = mock.MagicMock()
+    pd_read.return_value = data
+
+    with mock.patch.dict(sys.modules, {"cx_Oracle": ora_mock}):
+        ds = mllp_ds.OracleDataSource("bla", cfg, dbms_cfg)
+        ds.get_dataframe()
+
+    con = pd_read.call_args[1]["con"]
+    assert con._connection is ora_mock.connect.return_value
+    assert con.cursor().arraysize == (arraysize or mllp_ds.ORACLE_ARRAYSIZE)
+
+
+@mock.patch.dict(mllp_ds._oracle_pools, clear=True)
+@mock.patch("pandas.DataFrame.to_sql")
+@mock.patch("pandas.read_sql")
+@mock.patch(
+    "{}.get_user_pw".format(mllp_ds.__name__), return_value=("foo", "bar")
+)
+def test_oracle_session_pool(
+    user_pw, pd_read, df_write, oracledatasource_cfg_and_data
+):
+    """Datasources and datasinks of a connection should share its pool."""
+    cfg, dbms_cfg, data = oracledatasource_cfg_and_data()
+    dbms_cfg["session_pool"] = {"max": 8}
+    ora_mock = mock.MagicMock()
+    pool = ora_mock.SessionPool.return_value
+    pd_read.return_value = data
+
+    with mock.patch.dict(sys.modules, {"cx_Oracle": ora_mock}):
+        ds = mllp_ds.OracleDataSource("bla", cfg, dbms_cfg)
+        sink = mllp_ds.OracleDataSink("blub", {"table": "tbl"}, dbms_cfg)
+        df = ds.get_dataframe()
+        sink.put_dataframe(df)
+
+    pd.testing.assert_frame_equal(df, data)
+    ora_mock.connect.assert_not_called()
+    ora_mock.SessionPool.assert_called_once()
+    assert ora_mock.SessionPool.call_args[1]["min"] == 1
+    assert ora_mock.SessionPool.call_args[1]["max"] == 8
+    assert pd_read.call_args[1]["con"]._connection is pool.acquire.return_value
+    assert df_write.call_args[1]["con"] is pool.acquire.return_value
+    assert pool.acquire.call_count == pool.release.call_count == 2
+
+
+@mock.patch.dict(mllp_ds._oracle_pools, clear=True)
+@mock.patch("pandas.read_sql")
+@mock.patch(
+    "{}.get_user_pw".format(mllp_ds.__name__), return_value=("foo", "bar")
+)
+def test_oracle_session_pool_chunksize(
+    user_pw, pd_read, oracledatasource_cfg_and_data
+):
+    """Pooled connection should be kept until all chunks have been read."""
+    cfg, dbms_cfg, full_data = oracledatasource_cfg_and_data()
+    dbms_cfg["session_pool"] = True
+    iter_data = [full_data.iloc[:2, :].copy(), full_data.iloc[2:, :].copy()]
+    ora_mock = mock.MagicMock()
+    pool = ora_mock.SessionPool.return_value
+    pd_read.return_value = iter_data
+
+    with mock.patch.dict(sys.modules, {"cx_Oracle": ora_mock}):
+        ds = mllp_ds.OracleDataSource("bla", cfg, dbms_cfg)
+        df_gen = ds.get_dataframe(chunksize=2)
+        next(df_gen)
+        pool.release.assert_not_called()
+        next(df_gen)
+        with pytest.raises(StopIteration):
+            next(df_gen)
+    pool.release.assert_called_once()
+
+
 @mock.patch("pandas.read_sql")
 @mock.patch(
     "{}.get_user_pw".format(mllp_ds.__name__), return_value=("foo", "bar")
@@ -491,6 +830,29 @@ def test_oracledatasink_notimplemented(user_pw, oracledatasource_cfg_and_data):
 # SqlDataSource
 
 
+def test_fill_nas():
+    df = pd.DataFrame({"a": [1.0, 2.0], "b": ["x", None]})
+    result = mllp_ds.fill_nas(df)
+    assert result is df
+    assert df["b"][1] is np.nan
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"a": [1.0, 2.0], "b": ["x", "y"]},
+        {"a": [1.0, np.nan], "b": [1, 2]},
+        {"a": [pd.NaT, pd.Timestamp("2020-01-01")]},
+    ],
+)
+@mock.patch("pandas.DataFrame.fillna")
+def test_fill_nas_skips_clean_data(fillna, data):
+    df = pd.DataFrame(data)
+    chunks = list(mllp_ds.fill_nas([df, df.copy()], as_generator=True))
+    assert len(chunks) == 2
+    fillna.assert_not_called()
+
+
 @mock.patch("os.environ.get")
 def test_get_connection_args(env_get):
     """Should look up any _var-suffixed properties of the `options` subdict"""
@@ -523,6 +885,16 @@ def test_get_connection_args_no_options(env_get):
     env_get.assert_not_called()
 
 
+@mock.patch("os.environ.get")
+def test_get_connection_args_no_vars(env_get):
+    """Return a copy of the options if none is _var-suffixed"""
+    dbms_config = {"options": {"some": "option", "other": 1}}
+    connection_args = mllp_ds.get_connection_args(dbms_config)
+    assert connection_args == dbms_config["options"]
+    assert connection_args is not dbms_config["options"]
+    env_get.assert_not_called()
+
+
 @mock.patch("os.environ.get")
 def test_get_connection_args_missing_env_var(env_get, caplog):
     """Warn if _var specified, but no env var present"""
@@ -559,7 +931,9 @@ def sqldatasource_cfg_and_data():
         }
         return cfg, dbms_cfg, pd.DataFrame({"a": [1, 2, 3], "b": [3, 4, 5]})
 
-    return _inner
+    # Don't share engines (mocked per test) between tests
+    with mock.patch.dict(mllp_ds._sqlalchemy_engines, clear=True):
+        yield _inner
 
 
 @mock.patch("pandas.read_sql")
@@ -575,7 +949,11 @@ def test_sqldatasource_df(pd_read, sqldatasource_cfg_and_data):
 
     pd.testing.assert_frame_equal(df, data)
     sqla_mock.create_engine.assert_called_once_with(
-        dbms_cfg["connection_string"], connect_args={}, port=1234
+        dbms_cfg["connection_string"],
+        connect_args={},
+        port=1234,
+        pool_pre_ping=True,
+        pool_recycle=1800,
     )
     pd_read.assert_called_once()
 
@@ -600,6 +978,125 @@ def test_sqldatasource_df_chunksize(pd_read, sqldatasource_cfg_and_data):
     del sys.modules["sqlalchemy"]
 
 
+@mock.patch("pandas.read_sql")
+def test_sqldatasource_df_chunksize_streams(
+    pd_read, sqldatasource_cfg_and_data
+):
+    """SqlDataSource with chunksize should read from a streaming connection
+    and close it after the last chunk."""
+    cfg, dbms_cfg, full_data = sqldatasource_cfg_and_data()
+    iter_data = [full_data.iloc[:2, :].copy(), full_data.iloc[2:, :].copy()]
+    sqla_mock = mock.MagicMock()
+    sys.modules["sqlalchemy"] = sqla_mock
+    pd_read.return_value = iter_data
+
+    ds = mllp_ds.SqlDataSource("bla", cfg, dbms_cfg)
+    df_gen = ds.get_dataframe(chunksize=2)
+    conn = ds.engine.connect.return_value.execution_options.return_value
+    pd_read.assert_not_called()  # nothing is fetched before iterating
+
+    assert len(list(df_gen)) == 2
+    ds.engine.connect.return_value.execution_options.assert_called_once_with(
+        stream_results=True, max_row_buffer=2
+    )
+    assert pd_read.call_args[1]["con"] is conn
+    conn.close.assert_called_once()
+
+    del sys.modules["sqlalchemy"]
+
+
+@mock.patch("pandas.read_sql")
+def test_sqldatasource_statement_reused(pd_read, sqldatasource_cfg_and_data):
+    """The query should be wrapped in a text clause only once."""
+    cfg, dbms_cfg, data = sqldatasource_cfg_and_data()
+    sqla_mock = mock.MagicMock()
+    sys.modules["sqlalchemy"] = sqla_mock
+    pd_read.return_value = data
+
+    ds = mllp_ds.SqlDataSource("bla", cfg, dbms_cfg)
+    ds.get_dataframe({"id": 1})
+    ds.get_dataframe({"id": 2})
+
+    sqla_mock.text.assert_called_once_with(cfg["query"])
+    for call in pd_read.call_args_list:
+        assert call[0][0] is sqla_mock.text.return_value
+
+    del sys.modules["sqlalchemy"]
+
+
+def test_sqldatasource_shared_engine(sqldatasource_cfg_and_data):
+    """Datasources and datasinks with the same dbms config share an engine."""
+    cfg, dbms_cfg, _ = sqldatasource_cfg_and_data()
+    sqla_mock = mock.MagicMock()
+    sqla_mock.create_engine.side_effect = lambda *a, **kw: mock.MagicMock()
+    sys.modules["sqlalchemy"] = sqla_mock
+
+    ds1 = mllp_ds.SqlDataSource("bla", cfg, dbms_cfg)
+    ds2 = mllp_ds.SqlDataSource("blu", cfg, dict(dbms_cfg))
+    dsi = mllp_ds.SqlDataSink("bli", cfg, dbms_cfg)
+    ds3 = mllp_ds.SqlDataSource("blo", cfg, dict(dbms_cfg, port=4321))
+
+    assert ds1.engine is ds2.engine is dsi.engine
+    assert ds3.engine is not ds1.engine
+    assert sqla_mock.create_engine.call_count == 2
+
+    del sys.modules["sqlalchemy"]
+
+
+def test_sqldatasource_lazy_engine(sqldatasource_cfg_and_data):
+    """The engine should only be created when it is used."""
+    cfg, dbms_cfg, _ = sqldatasource_cfg_and_data()
+    sqla_mock = mock.MagicMock()
+    sys.modules["sqlalchemy"] = sqla_mock
+
+    ds = mllp_ds.SqlDataSource("bla", cfg, dbms_cfg)
+    sqla_mock.create_engine.assert_not_called()
+    assert ds.engine is ds.engine
+    sqla_mock.create_engine.assert_called_once()
+
+    del sys.modules["sqlalchemy"]
+
+
+@pytest.mark.parametrize("cls", [mllp_ds.SqlDataSource, mllp_ds.SqlDataSink])
+def test_sql_missing_sqlalchemy(cls, sqldatasource_cfg_and_data, caplog):
+    """A missing SQLAlchemy package is reported when configuring"""
+    cfg, dbms_cfg, _ = sqldatasource_cfg_and_data()
+    with mock.patch.dict(sys.modules, {"sqlalchemy": None}):
+        with pytest.raises(ModuleNotFoundError):
+            cls("bla", cfg, dbms_cfg)
+    assert "please install the sqlalchemy package" in caplog.text.lower()
+
+
+@pytest.mark.parametrize(
+    "connection_string, pool_options, expected",
+    [
+        ("sqlite://", {}, {}),
+        ("bla://host", {}, mllp_ds.SQLALCHEMY_POOL_DEFAULTS),
+        (
+            "bla://host",
+            {"pool_pre_ping": False, "pool_size": 2},
+            {"pool_pre_ping": False, "pool_recycle": 1800, "pool_size": 2},
+        ),
+    ],
+)
+def test_sqldatasource_pool_defaults(
+    connection_string, pool_options, expected, sqldatasource_cfg_and_data
+):
+    cfg, _, _ = sqldatasource_cfg_and_data()
+    dbms_cfg = dict(
+        type="sql", connection_string=connection_string, **pool_options
+    )
+    sqla_mock = mock.MagicMock()
+    sys.modules["sqlalchemy"] = sqla_mock
+
+    mllp_ds.SqlDataSource("bla", cfg, dbms_cfg).engine
+    sqla_mock.create_engine.assert_called_once_with(
+        connection_string, connect_args={}, **expected
+    )
+
+    del sys.modules["sqlalchemy"]
+
+
 def test_sqldatasource_notimplemented(sqldatasource_cfg_and_data):
     cfg, dbms_cfg, _ = sqldatasource_cfg_and_data()
     sqla_mock = mock.MagicMock()
@@ -621,9 +1118,13 @@ def test_sqldatasource_url_instead_of_connection_string(
     sqla_mock = mock.MagicMock()
     sys.modules["sqlalchemy"] = sqla_mock
 
-    mllp_ds.SqlDataSource("bla", cfg, dbms_cfg)
+    mllp_ds.SqlDataSource("bla", cfg, dbms_cfg).engine
     sqla_mock.create_engine.assert_called_once_with(
-        dbms_cfg["url"], connect_args={}, port=1234
+        dbms_cfg["url"],
+        connect_args={},
+        port=1234,
+        pool_pre_ping=True,
+        pool_recycle=1800,
     )
 
     del sys.modules["sqlalchemy"]
@@ -636,7 +1137,7 @@ def test_sqldatasource_double_url(sqldatasource_cfg_and_data):
     sys.modules["sqlalchemy"] = sqla_mock
 
     with pytest.raises(ValueError, match="connection_string"):
-        mllp_ds.SqlDataSource("bla", cfg, dbms_cfg)
+        mllp_ds.SqlDataSource("bla", cfg, dbms_cfg).engine
 
     del sys.modules["sqlalchemy"]
 
@@ -655,6 +1156,8 @@ def test_sqldatasink_df(df_write, sqldatasource_cfg_and_data):
 
     sqla_mock.create_engine.assert_called_once()
     df_write.assert_called_once()
+    assert df_write.call_args[1]["index"] is False
+    assert ds.options == {}  # configured options are left as they are
 
     del sys.modules["sqlalchemy"]
 
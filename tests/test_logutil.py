@@ -3,6 +3,9 @@
 # Stdlib imports
 from unittest import mock
 
+# Third-party imports
+import yaml
+
 # Project imports
 import mllaunchpad.logutil as lu
 
@@ -60,3 +63,19 @@ def test_init_logging_file(dc):
         _ = lu.init_logging("some_file.yml")
     mo.assert_called_once()
     dc.assert_called_once()
+
+
+@mock.patch("{}.logging.config.dictConfig".format(lu.__name__))
+def test_init_logging_file_cached(dc, tmp_path):
+    log_file = str(tmp_path / "some_file.yml")
+    with open(log_file, "w") as f:
+        f.write(logging_config)
+    with mock.patch.dict(lu._log_config_cache, clear=True):
+        with mock.patch("yaml.safe_load", side_effect=yaml.safe_load) as load:
+            _ = lu.init_logging(log_file)
+            _ = lu.init_logging(log_file)
+            load.assert_called_once()
+    assert dc.call_count == 2
+    first, second = (call[0][0] for call in dc.call_args_list)
+    assert first == second
+    assert first is not second
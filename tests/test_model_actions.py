@@ -1,6 +1,7 @@
 """Tests for `mllaunchpad.model_actions` module."""
 
 # Stdlib imports
+import copy
 import logging
 from unittest import mock
 
@@ -251,6 +252,60 @@ def test__get_model_maker(ms_class, imp, config):
     assert isinstance(mm, MockModelMakerClass)
 
 
+@mock.patch("builtins.__import__")
+@mock.patch("{}.resource.ModelStore".format(ma.__name__), autospec=True)
+def test__get_model_maker_registered(ms_class, imp, config):
+    ma.clear_caches()
+
+    class Registered:
+        pass
+
+    with mock.patch.dict(
+        ma.model_interface._MAKER_REGISTRY, {"blamodule": Registered}
+    ):
+        mm = ma._get_model_maker(config)
+    imp.assert_called_with("blamodule")
+    assert isinstance(mm, Registered)
+    ma.clear_caches()
+
+
+def test_register_model_maker():
+    class Registered:
+        pass
+
+    with mock.patch.dict(ma.model_interface._MAKER_REGISTRY, {}):
+        assert (
+            ma.model_interface.register_model_maker(Registered) is Registered
+        )
+        assert ma.model_interface._MAKER_REGISTRY[__name__] is Registered
+
+
+def test_register_model():
+    class Registered:
+        pass
+
+    with mock.patch.dict(ma.model_interface._MODEL_REGISTRY, {}):
+        assert ma.model_interface.register_model(Registered) is Registered
+        assert ma.model_interface._MODEL_REGISTRY[__name__] is Registered
+
+
+@mock.patch("builtins.__import__")
+@mock.patch("{}.resource.ModelStore".format(ma.__name__), autospec=True)
+def test__get_model_class_registered(ms_class, imp, config):
+    ma.clear_caches()
+
+    class Registered:
+        pass
+
+    with mock.patch.dict(
+        ma.model_interface._MODEL_REGISTRY, {"blamodule": Registered}
+    ):
+        m_cls = ma._get_model_class(config)
+    imp.assert_called_with("blamodule")
+    assert m_cls is Registered
+    ma.clear_caches()
+
+
 @mock.patch("builtins.__import__")
 @mock.patch("{}.resource.ModelStore".format(ma.__name__), autospec=True)
 def test__get_model_class(ms_class, imp, config):
@@ -260,6 +315,21 @@ def test__get_model_class(ms_class, imp, config):
     assert mc is MockModelClass
 
 
+@mock.patch("builtins.__import__")
+@mock.patch("{}.resource.ModelStore".format(ma.__name__), autospec=True)
+def test__get_model_class_shared_by_versions(ms_class, imp, config):
+    ma.clear_caches()
+    other_version = copy.deepcopy(config)
+    other_version["model"]["version"] = "other"
+    assert ma._get_model_class(config) is MockModelClass
+    assert ma._get_model_class(other_version) is MockModelClass
+    imp.assert_called_once_with("blamodule")
+    other_version["model"]["version"] = "uncached"
+    ma._get_model_class(other_version, cache=False)
+    assert imp.call_count == 2
+    ma.clear_caches()
+
+
 # @mock.patch("builtins.__import__")
 # @mock.patch("{}.resource.ModelStore".format(ma.__name__), autospec=True)
 # def test__get_model_class_error(ms_class, imp, config):
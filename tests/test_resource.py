@@ -4,7 +4,11 @@
 import json
 import logging
 import os
+import pickle
+import subprocess  # nosec
+import sys
 from collections import OrderedDict
+from datetime import datetime
 from random import random
 from unittest import mock
 
@@ -40,55 +44,277 @@ def modelstore_config():
 # fmt: on
 
 
-@mock.patch("{}.os.path.exists".format(r.__name__), return_value=False)
 @mock.patch("{}.os.makedirs".format(r.__name__))
-def test_modelstore_create(makedirs, path_exists, modelstore_config):
+def test_modelstore_create(makedirs, modelstore_config):
     ms = r.ModelStore(modelstore_config)
     ms._ensure_location()
     makedirs.assert_called_once_with(
-        modelstore_config["model_store"]["location"]
+        modelstore_config["model_store"]["location"], exist_ok=True
     )
 
-    path_exists.reset_mock()
-    makedirs.reset_mock()
-    path_exists.return_value = True
+
+def test_modelstore_create_existing(modelstore_config, tmp_path):
+    modelstore_config["model_store"]["location"] = str(tmp_path)
     ms = r.ModelStore(modelstore_config)
-    ms._ensure_location()
-    assert not makedirs.called
+    ms._ensure_location()  # must not raise
+    assert os.path.isdir(str(tmp_path))
 
 
-@mock.patch("{}.os.path.exists".format(r.__name__), return_value=False)
-@mock.patch("{}.os.makedirs".format(r.__name__))
-@mock.patch("{}.shutil.copy".format(r.__name__))
-@mock.patch(
-    "{}.glob.glob".format(r.__name__), return_value=["old.pkl", "old.json"]
-)
-def test_modelstore_dump(glob, copy, makedirs, path_exists, modelstore_config):
-    with mock.patch(
-        "{}.open".format(r.__name__), mock.mock_open(), create=True
-    ) as mo:
-        ms = r.ModelStore(modelstore_config)
+@mock.patch("{}._link_or_copy".format(r.__name__))
+@mock.patch("{}._dump_model_file".format(r.__name__))
+def test_modelstore_dump(dump_model, copy, modelstore_config, tmp_path):
+    modelstore_config["model_store"]["location"] = str(tmp_path)
+    model_conf = modelstore_config["model"]
+    file_name = "{}_{}".format(model_conf["name"], model_conf["version"])
+    base_name = os.path.join(str(tmp_path), file_name)
+    old_files = [file_name + ".pkl", file_name + ".json", file_name + "0.pkl"]
+    for old_file in old_files:
+        (tmp_path / old_file).write_text("{}")
+
+    ms = r.ModelStore(modelstore_config)
+    ms.dump_trained_model(
+        modelstore_config, {"pseudo_model": 1}, {"pseudo_metrics": 2}
+    )
+
+    dump_model.assert_called_once_with(
+        {"pseudo_model": 1}, "{}.pkl".format(base_name), 0
+    )
+    with open("{}.json".format(base_name), encoding="utf-8") as f:
+        meta = json.load(f)
+    assert meta["metrics"] == {"pseudo_metrics": 2}
+    assert meta["metrics_history"] == {meta["created"]: {"pseudo_metrics": 2}}
+    # Backups are named after the same point in time
+    infix = datetime.strptime(meta["created"], r.DATE_FORMAT).strftime(
+        r.DATE_FORMAT_FILES
+    )
+    backup_base = os.path.join(
+        str(tmp_path), "previous", "{}_{}".format(file_name, infix)
+    )
+    # Only back up this model's files, not e.g. those of version x.y.z0
+    assert sorted(copy.call_args_list) == [
+        mock.call(base_name + ".json", backup_base + ".json"),
+        mock.call(base_name + ".pkl", backup_base + ".pkl"),
+    ]
+    assert sorted(os.listdir(str(tmp_path))) == sorted(
+        old_files + ["previous"]
+    )
+
+
+@mock.patch("{}._dump_model_file".format(r.__name__))
+def test_modelstore_dump_first_time(dump_model, modelstore_config, tmp_path):
+    """Without a previous model, there is nothing to back up"""
+    modelstore_config["model_store"]["location"] = str(tmp_path)
+    ms = r.ModelStore(modelstore_config)
+    with mock.patch("{}.os.scandir".format(r.__name__)) as scandir:
         ms.dump_trained_model(
             modelstore_config, {"pseudo_model": 1}, {"pseudo_metrics": 2}
         )
+    assert not scandir.called
+    assert not os.path.exists(str(tmp_path / "previous"))
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_modelstore_metadata_roundtrip(use_orjson, tmp_path):
+    base_name = str(tmp_path / "my_model_1.0.0")
+    meta = {"metrics": {"a": 1.5, 2: [1, "ü"]}, "created_by": None}
+    orjson = r.orjson if use_orjson else None
+    with mock.patch("{}.orjson".format(r.__name__), new=orjson):
+        r.ModelStore(str(tmp_path))._dump_metadata(base_name, meta)
+        loaded = r.ModelStore(str(tmp_path))._load_metadata(base_name)
+    assert loaded == {"metrics": {"a": 1.5, "2": [1, "ü"]}, "created_by": None}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_dumps_non_finite(use_orjson):
+    """NaN/Infinity are kept the same way with and without orjson"""
+    if use_orjson and r.orjson is None:
+        pytest.skip("orjson not installed")
+    obj = {"a": float("nan"), "b": [float("inf"), -float("inf"), 1.5]}
+    orjson = r.orjson if use_orjson else None
+    with mock.patch("{}.orjson".format(r.__name__), new=orjson):
+        contents = r._json_dumps(obj)
+        loaded = r._json_loads(contents)
+    assert contents == json.dumps(obj, indent=2).encode("utf-8")
+    assert np.isnan(loaded["a"])
+    assert loaded["b"] == [float("inf"), -float("inf"), 1.5]
+
+
+def test_modelstore_load_metadata_cached(tmp_path):
+    base_name = str(tmp_path / "my_model_1.0.0")
+    with open(base_name + ".json", "w", encoding="utf-8") as f:
+        f.write('{"metrics": {"a": 1}}')
+    ms = r.ModelStore(str(tmp_path))
+    meta = ms._load_metadata(base_name)
+    meta["metrics"]["a"] = 2  # must not affect the cached metadata
+
+    with mock.patch("{}._json_loads".format(r.__name__)) as json_load:
+        assert ms._load_metadata(base_name) == {"metrics": {"a": 1}}
+    assert not json_load.called
+
+    with open(base_name + ".json", "w", encoding="utf-8") as f:
+        f.write('{"metrics": {"a": 333}}')  # differs in size
+    assert ms._load_metadata(base_name) == {"metrics": {"a": 333}}
+
+    ms._dump_metadata(base_name, {"metrics": {"a": 4}})
+    with mock.patch("{}._json_loads".format(r.__name__)) as json_load:
+        assert ms._load_metadata(base_name) == {"metrics": {"a": 4}}
+    assert not json_load.called
+
+
+@pytest.mark.parametrize("use_orjson", [False, True])
+def test_modelstore_dump_metadata_cached_as_read(use_orjson, tmp_path):
+    """Cached metadata must equal what is read from the file"""
+    if use_orjson and r.orjson is None:
+        pytest.skip("orjson not installed")
+    base_name = str(tmp_path / "my_model_1.0.0")
+    meta = {"metrics": {1: (2, 3)}, "created_by": None}
+    orjson = r.orjson if use_orjson else None
+    with mock.patch("{}.orjson".format(r.__name__), new=orjson):
+        ms = r.ModelStore(str(tmp_path))
+        ms._dump_metadata(base_name, meta)
+        cached = ms._load_metadata(base_name)
+        fresh = r.ModelStore(str(tmp_path))._load_metadata(base_name)
+    assert cached == fresh == {"metrics": {"1": [2, 3]}, "created_by": None}
+
+
+@pytest.mark.parametrize("can_link", [True, False])
+def test_link_or_copy(can_link, tmp_path):
+    src = str(tmp_path / "model.pkl")
+    dst = str(tmp_path / "model_backup.pkl")
+    with open(src, "wb") as f:
+        f.write(b"old")
+    with mock.patch(
+        "{}.os.link".format(r.__name__),
+        side_effect=None if can_link else OSError("cross-device link"),
+        wraps=os.link,
+    ):
+        r._link_or_copy(src, dst)
+    assert os.path.samefile(src, dst) == can_link
+
+    # Replacing the original file must not affect the backup
+    with r._replacing_file(src) as f:
+        f.write(b"new")
+    with open(dst, "rb") as f:
+        assert f.read() == b"old"
+
+
+def test_replacing_file_concurrent(tmp_path):
+    """Concurrent writers of the same file must not share a temp file"""
+    file_name = str(tmp_path / "my_model_1.0.0.pkl")
+    with r._replacing_file(file_name) as f1:
+        with r._replacing_file(file_name) as f2:
+            assert len(os.listdir(str(tmp_path))) == 2  # two temp files
+            f2.write(b"second")
+        f1.write(b"first")
+    with open(file_name, "rb") as f:
+        assert f.read() == b"first"
+    assert os.listdir(str(tmp_path)) == ["my_model_1.0.0.pkl"]
+    if os.name != "nt":
+        mode = os.stat(file_name).st_mode & 0o777
+        assert mode == 0o666 & ~r._get_umask()
+
+
+def test_modelstore_dump_metadata_unserializable(tmp_path):
+    base_name = str(tmp_path / "my_model_1.0.0")
+    ms = r.ModelStore(str(tmp_path))
+    ms._dump_metadata(base_name, {"some": "metadata"})
+    with pytest.raises(TypeError):
+        ms._dump_metadata(base_name, {"some": object()})
 
-    model_conf = modelstore_config["model"]
-    base_name = os.path.join(
-        modelstore_config["model_store"]["location"],
-        "{}_{}".format(model_conf["name"], model_conf["version"]),
+    # The previous metadata file stays intact, no temporary files are left
+    assert r.ModelStore(str(tmp_path))._load_metadata(base_name) == {
+        "some": "metadata"
+    }
+    assert os.listdir(str(tmp_path)) == ["my_model_1.0.0.json"]
+
+
+@pytest.mark.parametrize(
+    "oob, compress", [(True, 0), (False, 0), (True, 5), (False, 1)]
+)
+def test_model_file_roundtrip(oob, compress, tmp_path):
+    model = {
+        "weights": np.arange(1000, dtype=np.float64).reshape(10, 100),
+        "name": "my_model",
+    }
+    file_name = str(tmp_path / "my_model_1.0.0.pkl")
+    with mock.patch("{}._OOB_SUPPORTED".format(r.__name__), new=oob):
+        r._dump_model_file(model, file_name, compress)
+
+    with open(file_name, "rb") as f:
+        magic = f.read(len(r.OOB_MAGIC))
+    if compress:
+        assert magic.startswith(r._GZIP_MAGIC)
+        assert os.path.getsize(file_name) < model["weights"].nbytes
+    else:
+        assert (magic == r.OOB_MAGIC) == oob
+    assert os.listdir(str(tmp_path)) == ["my_model_1.0.0.pkl"]
+
+    loaded = r._load_model_file(file_name)
+    assert loaded["name"] == "my_model"
+    np.testing.assert_array_equal(loaded["weights"], model["weights"])
+    if oob and not compress:
+        assert loaded["weights"].ctypes.data % r._OOB_ALIGNMENT == 0
+    loaded["weights"][0, 0] = 42.0  # loaded arrays must stay writable
+
+    # Replacing a model must not affect one which is still loaded
+    r._dump_model_file({"other": np.zeros(3)}, file_name)
+    assert loaded["weights"][0, 1] == 1.0
+
+
+def test_pickle_dumps_out_of_band():
+    model = {"list": [[1, 2]] * 3, "weights": np.arange(10)}
+    stream, buffers = r._pickle_dumps(model, out_of_band=True)
+    assert len(buffers) == 1
+    assert str(pickle.loads(stream, buffers=buffers)) == str(model)
+
+
+@pytest.mark.parametrize("oob", [True, False])
+def test_model_file_dill_fallback(oob, tmp_path):
+    """Models which the standard pickle can't handle are pickled by dill"""
+    model = {"func": lambda x: x + 1, "weights": np.arange(10)}
+    file_name = str(tmp_path / "my_model_1.0.0.pkl")
+    with mock.patch("{}._OOB_SUPPORTED".format(r.__name__), new=oob):
+        r._dump_model_file(model, file_name)
+
+    loaded = r._load_model_file(file_name)
+    assert loaded["func"](1) == 2
+    np.testing.assert_array_equal(loaded["weights"], model["weights"])
+
+
+@pytest.mark.parametrize("oob, compress", [(True, 0), (False, 0), (True, 1)])
+def test_model_file_dill_by_value(oob, compress, tmp_path):
+    """Objects defined in __main__ are pickled by value and must load, too"""
+    file_name = str(tmp_path / "my_model_1.0.0.pkl")
+    script = "\n".join(
+        [
+            "from unittest import mock",
+            "from mllaunchpad import resource as r",
+            "class MyModel:",
+            "    def predict(self, x):",
+            "        return x * 2",
+            "model = {'model': MyModel(), 'func': lambda x: x + 1}",
+            "with mock.patch.object(r, '_OOB_SUPPORTED', new={!r}):".format(
+                oob
+            ),
+            "    r._dump_model_file(model, {!r}, {!r})".format(
+                file_name, compress
+            ),
+        ]
     )
-    calls = [
-        mock.call("{}.pkl".format(base_name), "wb"),
-        mock.call("{}.json".format(base_name), "w", encoding="utf-8"),
-    ]
-    mo.assert_has_calls(calls, any_order=True)
+    # Dumping in a separate process makes __main__ differ from ours
+    subprocess.run([sys.executable, "-c", script], check=True)  # nosec
+
+    loaded = r._load_model_file(file_name)
+    assert loaded["model"].predict(2) == 4
+    assert loaded["func"](1) == 2
 
 
 @mock.patch("{}.os.path.exists".format(r.__name__), return_value=True)
-@mock.patch("{}.pickle.dump".format(r.__name__))
-@mock.patch("{}.json.dump".format(r.__name__))
+@mock.patch("{}._dump_model_file".format(r.__name__))
+@mock.patch("{}.ModelStore._dump_metadata".format(r.__name__))
+@mock.patch("{}.ModelStore._backup_old_model".format(r.__name__))
 def test_modelstore_dump_extra_model_keys(
-    jsond, pickled, path_exists, modelstore_config
+    backup, jsond, pickled, path_exists, modelstore_config
 ):
     modelstore_config["model"]["extraparam"] = 42
     modelstore_config["model"]["anotherparam"] = 23
@@ -101,7 +327,7 @@ def test_modelstore_dump_extra_model_keys(
             modelstore_config, {"pseudo_model": 1}, {"pseudo_metrics": 2}
         )
 
-    dumped = jsond.call_args[0][0]
+    dumped = jsond.call_args[0][1]
     print(modelstore_config)
     print(dumped)
     assert "extraparam" in dumped
@@ -112,10 +338,11 @@ def test_modelstore_dump_extra_model_keys(
 
 
 @mock.patch("{}.os.path.exists".format(r.__name__), return_value=True)
-@mock.patch("{}.pickle.dump".format(r.__name__))
-@mock.patch("{}.json.dump".format(r.__name__))
+@mock.patch("{}._dump_model_file".format(r.__name__))
+@mock.patch("{}.ModelStore._dump_metadata".format(r.__name__))
+@mock.patch("{}.ModelStore._backup_old_model".format(r.__name__))
 def test_modelstore_train_report(
-    jsond, pickled, path_exists, modelstore_config
+    backup, jsond, pickled, path_exists, modelstore_config
 ):
     with mock.patch(
         "{}.open".format(r.__name__), mock.mock_open(), create=True
@@ -126,7 +353,7 @@ def test_modelstore_train_report(
             modelstore_config, {"pseudo_model": 1}, {"pseudo_metrics": 2}
         )
 
-    dumped = jsond.call_args[0][0]
+    dumped = jsond.call_args[0][1]
     print(modelstore_config)
     print(dumped)
     assert "train_report" in dumped
@@ -215,11 +442,14 @@ def test_list_models_ignore_obsolete_backups(
     assert "ignoring" in caplog.text.lower()
 
 
-@mock.patch("{}.pickle.load".format(r.__name__), return_value="pickle")
-@mock.patch("{}.json.load".format(r.__name__), return_value={"json": 0})
-def test_modelstore_load(json, pkl, modelstore_config):
+@mock.patch("{}.os.stat".format(r.__name__))
+@mock.patch("{}.dill.load".format(r.__name__), return_value="pickle")
+@mock.patch("{}._json_loads".format(r.__name__), return_value={"json": 0})
+def test_modelstore_load(json, pkl, stat, modelstore_config):
     with mock.patch(
-        "{}.open".format(r.__name__), mock.mock_open(), create=True
+        "{}.open".format(r.__name__),
+        mock.mock_open(read_data=b""),
+        create=True,
     ) as mo:
         ms = r.ModelStore(modelstore_config)
         ms.load_trained_model(modelstore_config["model"])
@@ -231,28 +461,56 @@ def test_modelstore_load(json, pkl, modelstore_config):
     )
     calls = [
         mock.call("{}.pkl".format(base_name), "rb"),
-        mock.call("{}.json".format(base_name), "r", encoding="utf-8"),
+        mock.call("{}.json".format(base_name), "rb"),
     ]
     mo.assert_has_calls(calls, any_order=True)
 
 
-@mock.patch(
-    "{}.ModelStore._load_metadata".format(r.__name__),
-    return_value={"metrics": {"a": 0}, "metrics_history": {"0123": {"a": 0}}},
-)
-@mock.patch("{}.ModelStore._dump_metadata".format(r.__name__))
-def test_modelstore_update_model_metrics(dump, load, modelstore_config):
-    new_metrics = {"a": 1}
+def test_modelstore_update_model_metrics(modelstore_config, tmp_path):
+    modelstore_config["model_store"]["location"] = str(tmp_path)
     ms = r.ModelStore(modelstore_config)
-    ms.update_model_metrics(modelstore_config["model"], new_metrics)
-    load.assert_called_once()
-    dump.assert_called_once()
-    name, contents = dump.call_args[0]
-    assert contents["metrics"] == new_metrics
-    hist = contents["metrics_history"]
-    assert len(hist) == 2
+    model_conf = modelstore_config["model"]
+    base_name = ms._get_model_base_name(model_conf)
+    old_meta = {"metrics": {"a": 0}, "metrics_history": {"0123": {"a": 0}}}
+    ms._dump_metadata(base_name, old_meta)
+
+    new_metrics = {"a": 1}
+    ms.update_model_metrics(model_conf, new_metrics)
+    ms.update_model_metrics(model_conf, new_metrics)
+
+    # The metadata file itself does not accumulate the history
+    assert ms._load_metadata(base_name) == {
+        "metrics": new_metrics,
+        "metrics_history": {"0123": {"a": 0}},
+    }
+    with open(base_name + r.HISTORY_SUFFIX, "rb") as f:
+        assert len(f.readlines()) == 2
+    meta = ms._load_metadata_with_history(base_name)
+    assert meta["metrics"] == new_metrics
+    hist = meta["metrics_history"]
     del hist["0123"]
-    assert hist.popitem()[1] == new_metrics
+    assert list(hist.values()) == [new_metrics]
+
+
+@mock.patch("{}._dump_model_file".format(r.__name__))
+def test_modelstore_dump_resets_metrics_history(
+    dump_model, modelstore_config, tmp_path
+):
+    modelstore_config["model_store"]["location"] = str(tmp_path)
+    ms = r.ModelStore(modelstore_config)
+    base_name = ms._get_model_base_name(modelstore_config["model"])
+    for ext in [".pkl", r.HISTORY_SUFFIX]:
+        with open(base_name + ext, "w") as f:
+            f.write('{"2000-01-01 00:00:00": {"a": 0}}\n')
+
+    ms.dump_trained_model(modelstore_config, {"pseudo_model": 1}, {"a": 1})
+
+    assert not os.path.exists(base_name + r.HISTORY_SUFFIX)
+    backups = os.listdir(str(tmp_path / "previous"))
+    assert len(backups) == 2
+    assert any(b.endswith(r.HISTORY_SUFFIX) for b in backups)
+    meta = ms._load_metadata_with_history(base_name)
+    assert list(meta["metrics_history"].values()) == [{"a": 1}]
 
 
 def test___get_all_classes():
@@ -264,6 +522,54 @@ def test___get_all_classes():
     assert "food" in classes
 
 
+def test___get_all_classes_cached():
+    """The class lookup table is only built once per plugin list"""
+    config = {"plugins": ["tests.mock_plugin"]}
+    classes = r._get_all_classes(config, r.DataSource)
+    with mock.patch("builtins.__import__") as imp:
+        assert r._get_all_classes(config, r.DataSource) == classes
+    assert not imp.called
+    assert "food" not in r._get_all_classes({}, r.DataSource)
+    with pytest.raises(TypeError):
+        classes["food"] = None  # shared, so it must not be modified
+
+
+def test___get_all_classes_later_subclass():
+    """Classes defined after the first lookup are found, too"""
+    config = {"plugins": [__name__]}
+    assert "later" not in r._get_all_classes(config, r.DataSource)
+
+    class LaterDataSource(r.DataSource):
+        serves = ["later"]
+
+        def get_dataframe(self, params=None, chunksize=None):
+            pass
+
+        def get_raw(self, params=None, chunksize=None):
+            pass
+
+    classes = r._get_all_classes(config, r.DataSource)
+    assert classes["later"] is LaterDataSource
+
+
+@pytest.mark.parametrize(
+    "tags, other_tags, expected",
+    [
+        (None, None, True),
+        (None, ["train"], True),
+        ([], "train", True),
+        ("train", None, True),
+        ("train", "train", True),
+        ("train", ["test", "train"], True),
+        (["train", "predict"], "predict", True),
+        ("train", "test", False),
+        (["train"], ["test", "predict"], False),
+    ],
+)
+def test_tags_matcher(tags, other_tags, expected):
+    assert r._get_tags_matcher(tags)(other_tags) == expected
+
+
 def test_create_data_sources_and_sinks():
     conf = {
         "plugins": ["tests.mock_plugin"],
@@ -281,8 +587,8 @@ def test_create_data_sources_and_sinks():
     }
     src, snk = r.create_data_sources_and_sinks(conf, tags=["weirdtag"])
     assert "bla" not in src
-    assert "foo" in snk
-    assert "blargh" in snk
+    assert list(snk) == ["foo", "blargh"]  # keeps the configured order
+    assert snk["blargh"].id == "blargh"
     src, snk = r.create_data_sources_and_sinks(conf)
     assert "bla" in src
     assert "foo" in snk
@@ -292,6 +598,26 @@ def test_create_data_sources_and_sinks():
         r.create_data_sources_and_sinks(conf)
 
 
+@pytest.mark.parametrize("concurrent", [None, False, True])
+def test_create_data_sources_and_sinks_concurrent_init(concurrent):
+    conf = {
+        "plugins": ["tests.mock_plugin"],
+        "datasinks": {
+            "foo": {"type": "food", "path": "some/path"},
+            "bar": {"type": "food", "path": "other/path"},
+        },
+    }
+    if concurrent is not None:
+        conf["concurrent_init"] = concurrent
+    with mock.patch(
+        "{}.ThreadPoolExecutor".format(r.__name__),
+        wraps=r.ThreadPoolExecutor,
+    ) as pool:
+        _, snk = r.create_data_sources_and_sinks(conf)
+    assert list(snk) == ["foo", "bar"]
+    assert pool.called == bool(concurrent)
+
+
 # Test DataSource caching
 
 # fmt: off
@@ -377,6 +703,63 @@ def test_datasource_expires_raw(
     assert (raw2 is raw1) == expected_cached
 
 
+def test_datasource_cache_non_json_params(datasource_expires_config):
+    """Params which are not JSON-serializable can be used as cache keys"""
+    ds = MockDataSource("mock", datasource_expires_config(-1))
+    params1 = {"day": datetime(2020, 1, 1), "id": np.int64(1)}
+    params2 = {"day": datetime(2020, 1, 2), "id": np.int64(1)}
+    raw1 = ds.get_raw(params=params1)
+    assert ds.get_raw(params=params1.copy()) is raw1
+    assert ds.get_raw(params=params2) is not raw1
+
+    # repr abbreviates large arrays, the cache key must not
+    arr1 = np.zeros(2000)
+    arr2 = arr1.copy()
+    arr2[1000] = 1.0
+    raw1 = ds.get_raw(params={"ids": arr1})
+    assert ds.get_raw(params={"ids": arr1.copy()}) is raw1
+    assert ds.get_raw(params={"ids": arr2}) is not raw1
+
+
+def test_datasource_cache_inexact_params(datasource_expires_config):
+    """Params which can't be encoded exactly bypass the cache"""
+    ds = MockDataSource("mock", datasource_expires_config(-1))
+    params = {"obj": object()}
+    raw1 = ds.get_raw(params=params)
+    assert raw1 is params
+    assert len(ds._cache) == 0
+
+
+@pytest.mark.parametrize(
+    "value1, value2",
+    [
+        (datetime(2020, 1, 1), "2020-01-01T00:00:00"),
+        (np.arange(3), [0, 1, 2]),
+        (np.arange(3), np.arange(3).reshape(3, 1)),
+        (np.arange(3), np.arange(3.0)),
+        (pd.Timestamp("2020-01-01 00:00:00.000000001"), datetime(2020, 1, 1)),
+    ],
+)
+def test_params_key_exact(value1, value2):
+    assert r.params_key({"v": value1}) == r.params_key({"v": value1})
+    assert r.params_key({"v": value1}) != r.params_key({"v": value2})
+
+
+def test_datasource_expired_items_removed(datasource_expires_config):
+    """Expired items must not be kept in memory"""
+    ds = MockDataSource("mock", datasource_expires_config(100))
+    with mock.patch("{}.time".format(r.__name__), return_value=1000.0):
+        ds.get_raw(params={"a": 1})
+        ds.get_raw(params={"a": 2})
+    assert len(ds._cache) == 2
+    with mock.patch("{}.time".format(r.__name__), return_value=1101.0):
+        ds.get_raw(params={"a": 1})  # expired, fetched and cached again
+        assert len(ds._cache) == 1
+        ds.get_raw(params={"a": 3})
+    assert len(ds._cache) == 2
+    assert ds._get_cached(("get_raw", '{"a": 2}', None)) is None
+
+
 def test_datasource_memoization_df(datasource_expires_config):
     args1 = {"a": [1, 2, 3], "b": [3, 4, 5]}
     args2_same = {"a": [1, 2, 3], "b": [3, 4, 5]}
@@ -407,7 +790,7 @@ def test_datasource_memoization_df(datasource_expires_config):
     pd.testing.assert_frame_equal(df4, pd.DataFrame(args1))
     assert df4 is df1  # from cache
 
-    # 5th DF read (yet unseen params passed -- will be cached, replacing args1)
+    # 5th DF read (yet unseen params passed -- will be cached, replacing args3, which was least recently used)
     df5 = ds.get_dataframe(params=args4_again_different.copy())
     pd.testing.assert_frame_equal(df5, pd.DataFrame(args4_again_different))
     assert df5 is not df4  # not from cache
@@ -415,14 +798,15 @@ def test_datasource_memoization_df(datasource_expires_config):
     assert df5 is not df2  # not from cache
     assert df5 is not df1  # not from cache
 
-    # 6th DF read (original params passed -- not in cache any more due to cache size limit of 2)
+    # 6th DF read (original params passed -- still in cache because it has been used recently)
     df6 = ds.get_dataframe(params=args1.copy())
     pd.testing.assert_frame_equal(df6, pd.DataFrame(args1))
-    assert df6 is not df5  # not from cache
-    assert df6 is not df4  # not from cache
-    assert df6 is not df3  # not from cache
-    assert df6 is not df2  # not from cache
-    assert df6 is not df1  # not from cache
+    assert df6 is df1  # from cache
+
+    # 7th DF read (args3 passed again -- not in cache any more due to cache size limit of 2)
+    df7 = ds.get_dataframe(params=args3_different.copy())
+    pd.testing.assert_frame_equal(df7, pd.DataFrame(args3_different))
+    assert df7 is not df3  # not from cache
 
 
 def test_get_user_pw(caplog):
@@ -34,3 +34,50 @@ def test_yaml_include(mo):
     with open(test_file_yaml) as f:
         data = yaml.load(f, yloader.SafeIncludeLoader)
         assert data["dbms"]["xob10"]["type"] == "oracle"
+
+
+def test_yaml_include_nested(tmp_path):
+    """Included files are resolved relative to the including file."""
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "main.yml").write_bytes(b"a: !include sub/a.yml\n")
+    (tmp_path / "sub" / "a.yml").write_bytes(b"b: !include b.yml\n")
+    (tmp_path / "sub" / "b.yml").write_bytes("c: ü\n".encode("utf-8"))
+
+    raw = (tmp_path / "main.yml").read_bytes()
+    loader = yloader.SafeIncludeLoader(raw, root=str(tmp_path))
+    try:
+        data = loader.get_single_data()
+    finally:
+        loader.dispose()
+
+    assert data == {"a": {"b": {"c": "ü"}}}
+    assert loader.included_files == [
+        str(tmp_path / "sub" / "a.yml"),
+        str(tmp_path / "sub" / "b.yml"),
+    ]
+
+
+def test_yaml_include_cached(tmp_path):
+    """Unchanged included files are not parsed again."""
+    (tmp_path / "a.yml").write_bytes(b"b: !include b.yml\n")
+    (tmp_path / "b.yml").write_bytes(b"c: 1\n")
+    main = b"a: !include a.yml\n"
+    yloader._include_cache.clear()
+
+    def load():
+        loader = yloader.SafeIncludeLoader(main, root=str(tmp_path))
+        try:
+            return loader.get_single_data()
+        finally:
+            loader.dispose()
+
+    first = load()
+    with mock.patch("builtins.open", wraps=open) as mo:
+        second = load()
+    mo.assert_not_called()
+    assert second == first == {"a": {"b": {"c": 1}}}
+    assert second is not first
+
+    (tmp_path / "b.yml").write_bytes(b"c: 22\n")  # nested include changed
+    assert load() == {"a": {"b": {"c": 22}}}
+    yloader._include_cache.clear()